@@ -0,0 +1,147 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Nintendo Switch data source ingest module for Autopsy.
+#
+# Rather than having every parser look at every file in the image, the known
+# Switch saves are looked up once per data source through the FileManager and
+# each hit is handed to the parser that understands it.
+
+import inspect
+import traceback
+from java.lang import Throwable
+from java.util.logging import Level
+from org.sleuthkit.autopsy.ingest import IngestModule
+from org.sleuthkit.autopsy.ingest.IngestModule import IngestModuleException
+from org.sleuthkit.autopsy.ingest import DataSourceIngestModule
+from org.sleuthkit.autopsy.ingest import IngestModuleFactoryAdapter
+from org.sleuthkit.autopsy.coreutils import Logger
+from org.sleuthkit.autopsy.casemodule import Case
+
+from ingest_wifi import WiFiIngestModule
+from ingest_power_states import PowerStateChangeIngestModule
+from ingest_crash_dumps import CrashDumpIngestModule
+from ingest_game_history import GameHistoryIngestModule
+from ingest_device_accounts import DeviceAccountIngestModule
+from ingest_last_boot import FindLastBootIngestModule
+from ingest_connected_displays import ConnectedDisplayIngestModule
+from ingest_mp_user_history import MpUserHistoryIngestModule
+from ingest_gamesaves import GamesaveIngestModule
+from ingest_screenshots import FindScreenshotsIngestModule
+from switch_state import IngestState
+
+
+PARSERS = [
+    WiFiIngestModule,
+    PowerStateChangeIngestModule,
+    CrashDumpIngestModule,
+    GameHistoryIngestModule,
+    DeviceAccountIngestModule,
+    FindLastBootIngestModule,
+    ConnectedDisplayIngestModule,
+    MpUserHistoryIngestModule,
+    GamesaveIngestModule,
+    FindScreenshotsIngestModule,
+]
+
+
+class SwitchIngestModuleFactory(IngestModuleFactoryAdapter):
+
+    moduleName = "Nintendo Switch"
+
+    def getModuleDisplayName(self):
+        return self.moduleName
+
+    def getModuleDescription(self):
+        return "Module that finds the known Nintendo Switch saves and albums and extracts their artifacts."
+
+    def getModuleVersionNumber(self):
+        return "1.0"
+
+    def isDataSourceIngestModuleFactory(self):
+        return True
+
+    def createDataSourceIngestModule(self, ingestOptions):
+        return SwitchIngestModule()
+
+
+class SwitchIngestModule(DataSourceIngestModule):
+
+    _logger = Logger.getLogger(SwitchIngestModuleFactory.moduleName)
+
+    # A Java exception is logged with its stack trace, for a Python one the
+    # traceback of the exception being handled is added to the message
+    def log(self, level, msg, e=None):
+        method = inspect.stack()[1][3]
+        if isinstance(e, Throwable):
+            self._logger.logp(level, self.__class__.__name__, method, msg, e)
+        elif e is not None:
+            self._logger.logp(level, self.__class__.__name__, method, "%s\n%s" % (msg, traceback.format_exc()))
+        else:
+            self._logger.logp(level, self.__class__.__name__, method, msg)
+
+    def startUp(self, context):
+        self.context = context
+        self.parsers = []
+
+        for parser_class in PARSERS:
+            parser = parser_class()
+            # A parser missing its dependencies should not stop the others from running
+            try:
+                parser.startUp(context)
+            except IngestModuleException as e:
+                self.log(Level.SEVERE, "Disabling %s: %s" % (parser.moduleName, e.getMessage()))
+                continue
+            self.parsers.append(parser)
+
+        pass
+
+    def process(self, dataSource, progressBar):
+        progressBar.switchToIndeterminate()
+
+        fileManager = Case.getCurrentCase().getServices().getFileManager()
+
+        # Parsers that read the same save share a single query
+        results = {}
+        work = []
+        for parser in self.parsers:
+            for query in parser.FILE_QUERIES:
+                if query not in results:
+                    (name, parent) = query
+                    if parent is None:
+                        results[query] = fileManager.findFiles(dataSource, name)
+                    else:
+                        results[query] = fileManager.findFiles(dataSource, name, parent)
+                work.extend((parser, file) for file in results[query])
+
+        self.log(Level.INFO, "Found %d Switch files to parse" % len(work))
+        progressBar.switchToDeterminate(len(work))
+
+        try:
+            for (count, (parser, file)) in enumerate(work):
+                if self.context.dataSourceIngestIsCancelled():
+                    return IngestModule.ProcessResult.OK
+
+                try:
+                    parser.process(file)
+                except (Exception, Throwable) as e:
+                    self.log(Level.SEVERE, "%s failed on %s" % (parser.moduleName, file.getUniquePath()), e)
+
+                progressBar.progress(count + 1)
+
+            for parser in self.parsers:
+                if self.context.dataSourceIngestIsCancelled():
+                    return IngestModule.ProcessResult.OK
+                try:
+                    parser.flush()
+                except (Exception, Throwable) as e:
+                    self.log(Level.SEVERE, "%s failed to post its artifacts" % parser.moduleName, e)
+
+            return IngestModule.ProcessResult.OK
+        finally:
+            # What the parsers did with each file is written once per data source
+            IngestState.getInstance().save()
+
+    def shutDown(self):
+        for parser in self.parsers:
+            parser.shutDown()
@@ -0,0 +1,135 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Blackboard helpers shared by the Nintendo Switch parsers.
+
+import inspect
+from java.lang import Long
+from java.util import ArrayList
+from java.util.logging import Level
+from org.sleuthkit.datamodel import BlackboardAttribute
+from org.sleuthkit.autopsy.ingest import IngestServices
+from org.sleuthkit.autopsy.ingest import ModuleDataEvent
+from org.sleuthkit.autopsy.coreutils import Logger
+from org.sleuthkit.autopsy.casemodule import Case
+from org.sleuthkit.autopsy.casemodule.services import Blackboard
+
+try:
+    from org.sleuthkit.datamodel import Blackboard as TskBlackboard
+except ImportError:
+    # Sleuth Kit before 4.7, artifacts are indexed and announced one type at a time
+    TskBlackboard = None
+
+
+# Attribute value types given as Java longs, Jython would pick the int constructor
+LONG_VALUE_TYPES = [
+    BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.LONG,
+    BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME,
+]
+
+
+# Collects the artifacts a parser finds in one file and posts them together:
+# each artifact gets all of its attributes in a single addAttributes call, and
+# the whole batch is posted to the blackboard with one postArtifacts call, which
+# indexes it for keyword search, puts its times on the timeline and tells the UI.
+class ArtifactBatch(object):
+
+    _logger = Logger.getLogger("Nintendo Switch")
+
+    def log(self, level, msg):
+        self._logger.logp(level, self.__class__.__name__, inspect.stack()[1][3], msg)
+
+    def __init__(self, file, moduleName, setName, types, index=False):
+        self.file = file
+        self.moduleName = moduleName
+        self.setName = setName
+        self.types = types
+        self.index = index
+        self.pending = []
+
+    # attributes is a list of (attribute type name, value) pairs. The artifact
+    # goes on file if given, so one batch can post for many files.
+    def add(self, artifactTypeName, attributes, file=None):
+        attributeList = ArrayList()
+        attributeList.add(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_SET_NAME.getTypeID(), self.moduleName, self.setName))
+        for (attributeTypeName, value) in attributes:
+            attributeType = self.types.attributeType(attributeTypeName)
+            if attributeType.getValueType() in LONG_VALUE_TYPES:
+                value = Long(value)
+            attributeList.add(BlackboardAttribute(attributeType, self.moduleName, value))
+        self.pending.append((file or self.file, artifactTypeName, attributeList))
+
+    def __len__(self):
+        return len(self.pending)
+
+    # Write the pending artifacts, returns how many were written
+    def commit(self):
+        if not self.pending:
+            return 0
+
+        artifacts = ArrayList()
+        posted = {}
+        for (file, artifactTypeName, attributeList) in self.pending:
+            art = file.newArtifact(self.types.artifactTypeID(artifactTypeName))
+            art.addAttributes(attributeList)
+            artifacts.add(art)
+            posted.setdefault(artifactTypeName, ArrayList()).add(art)
+
+        if TskBlackboard is not None:
+            try:
+                Case.getCurrentCase().getSleuthkitCase().getBlackboard().postArtifacts(artifacts, self.moduleName)
+            except TskBlackboard.BlackboardException as e:
+                self.log(Level.SEVERE, "Error posting %d artifacts: %s" % (artifacts.size(), e.getMessage()))
+        else:
+            self.postLegacy(posted)
+
+        count = len(self.pending)
+        self.pending = []
+        return count
+
+    # Without postArtifacts each artifact is indexed on its own and the UI is
+    # told once per artifact type
+    def postLegacy(self, posted):
+        if self.index:
+            blackboard = Case.getCurrentCase().getServices().getBlackboard()
+            for artifacts in posted.values():
+                for art in artifacts:
+                    try:
+                        # index the artifact for keyword search
+                        blackboard.indexArtifact(art)
+                    except Blackboard.BlackboardException:
+                        self.log(Level.SEVERE, "Error indexing artifact " + art.getDisplayName())
+
+        # Fire one event per artifact type to notify the UI and others that there are new artifacts
+        for (artifactTypeName, artifacts) in posted.items():
+            IngestServices.getInstance().fireModuleDataEvent(ModuleDataEvent(self.moduleName, self.types.artifactType(artifactTypeName), artifacts))
+
+
+# The attribute values of the artifacts a file already has, read once per file
+# so that records found again on a re-ingest are skipped with a set lookup
+# instead of comparing against every existing artifact.
+class ArtifactKeys(object):
+
+    def __init__(self, file, artifactTypeName, attributeTypeNames, types):
+        self.keys = set()
+
+        for artifact in file.getArtifacts(types.artifactTypeID(artifactTypeName)):
+            values = {}
+            for attribute in artifact.getAttributes():
+                # Times are compared as the seconds the parsers give, not as displayed
+                if attribute.getValueType() in LONG_VALUE_TYPES:
+                    value = attribute.getValueLong()
+                else:
+                    value = attribute.getValueString()
+                values[attribute.getAttributeType().getTypeName()] = value
+            self.keys.add(tuple([values.get(name) for name in attributeTypeNames]))
+
+    def __len__(self):
+        return len(self.keys)
+
+    # True if the key was already present, otherwise it is remembered for next time
+    def seen(self, key):
+        if key in self.keys:
+            return True
+        self.keys.add(key)
+        return False
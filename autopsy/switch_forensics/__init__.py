@@ -0,0 +1,23 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Nintendo Switch artifact parsers.
+#
+# Nothing in this package depends on Autopsy or Jython: the Autopsy ingest
+# modules next to it are adapters over these parsers, and the switch-forensics
+# command (switch_forensics.cli) runs the same parsers on CPython.
+#
+# Each parser module has
+#
+#     ARTIFACT          the artifact type it produces
+#     KEY               attribute types that identify an artifact already found
+#     VERSION           raised whenever a change to the parser changes its output,
+#                       so files parsed by an older version are parsed again
+#     matches(source)   True if the source is a file the parser reads
+#     parse(source)     yields (artifact type, [(attribute type, value), ...])
+#
+# where a source is a file with name, parentPath (such as /save/), mtime (its
+# modification time in seconds since 1970), size and read(offset, size).
+#
+# Attributes with a DATETIME type in switch_forensics.schema take seconds since
+# 1970, UTC.
@@ -0,0 +1,6 @@
+import sys
+
+from switch_forensics.cli import main
+
+
+sys.exit(main())
@@ -0,0 +1,10 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Third party code shipped with switch_forensics.
+#
+#     msgpack   msgpack-python 0.6.1 with the pure Python Unpacker extended to read
+#               buffers in place (reset, view_raw, unpack_buffers) and to skip
+#               unused map keys (map_keys). It lives here, not as a top-level
+#               msgpack, so that installing switch_forensics leaves any other
+#               msgpack alone.
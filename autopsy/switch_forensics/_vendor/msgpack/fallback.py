@@ -59,7 +59,7 @@ else:
     newlist_hint = lambda size: []
 
 
-from msgpack.exceptions import (
+from .exceptions import (
     BufferFull,
     OutOfData,
     ExtraData,
@@ -67,7 +67,7 @@ from msgpack.exceptions import (
     StackError,
 )
 
-from msgpack import ExtType
+from . import ExtType
 
 
 EX_SKIP                 = 0
@@ -131,7 +131,7 @@ def unpackb(packed, **kwargs):
     See :class:`Unpacker` for options.
     """
     unpacker = Unpacker(None, max_buffer_size=len(packed), **kwargs)
-    unpacker.feed(packed)
+    unpacker.reset(packed)
     try:
         ret = unpacker._unpack()
     except OutOfData:
@@ -145,6 +145,34 @@ def unpackb(packed, **kwargs):
     return ret
 
 
+def unpack_buffers(buffers, **kwargs):
+    """
+    Unpack one object from each buffer in `buffers`, in order.
+
+    Buffers are read in place with :meth:`Unpacker.reset`, and the same
+    Unpacker is used for all of them.  With ``view_raw=True`` bytes values
+    are memoryviews of the buffer they were read from; map keys and extra
+    data are always copied.
+
+    Raises the same exceptions as :func:`unpackb`.
+    See :class:`Unpacker` for options.
+    """
+    unpacker = Unpacker(None, **kwargs)
+    for packed in buffers:
+        unpacker.reset(packed)
+        try:
+            ret = unpacker._unpack()
+        except OutOfData:
+            raise ValueError("Unpack failed: incomplete input")
+        except RecursionError as e:
+            if _is_recursionerror(e):
+                raise StackError
+            raise
+        if unpacker._got_extradata():
+            raise ExtraData(ret, unpacker._get_extradata())
+        yield ret
+
+
 if sys.version_info < (2, 7, 6):
     def _unpack_from(f, b, o=0):
         """Explicit typcast for legacy struct.unpack_from"""
@@ -184,6 +212,21 @@ class Unpacker(object):
         It's False by default for backward-compatibility.
         But it will be True from msgpack 1.0.
 
+    :param map_keys:
+        Keys to keep from the outermost map of each unpacked object, as a
+        container of keys or a callable taking a key and returning true to
+        keep it.  The values of other keys are skipped without being built.
+        Maps nested in the values kept, and maps inside arrays, are unpacked
+        in full.  (default: None, keep every key)
+
+    :param bool view_raw:
+        If true, bin values (and raw values when *raw* is true) read from a
+        buffer given to :meth:`reset` are returned as memoryview slices of
+        that buffer instead of being copied to bytes.  They are only valid
+        while the buffer is.  Map keys are always copied to bytes, so that
+        they can be hashed and kept.  Has no effect on fed or file data.
+        (default: False)
+
     :param callable object_hook:
         When specified, it should be callable.
         Unpacker calls it with a dict argument after unpacking msgpack map.
@@ -244,6 +287,13 @@ class Unpacker(object):
             for o in unpacker:
                 process(o)
 
+    Example of deserializing many buffers, such as mmaps, in place::
+
+        unpacker = Unpacker(raw=False)
+        for buf in buffers:
+            unpacker.reset(buf)
+            process(unpacker.unpack())
+
     Raises ``ExtraData`` when *packed* contains extra bytes.
     Raises ``OutOfData`` when *packed* is incomplete.
     Raises ``FormatError`` when *packed* is not valid msgpack.
@@ -251,7 +301,7 @@ class Unpacker(object):
     Other exceptions can be raised during unpacking.
     """
 
-    def __init__(self, file_like=None, read_size=0, use_list=True, raw=True, strict_map_key=False,
+    def __init__(self, file_like=None, read_size=0, use_list=True, raw=True, strict_map_key=False, map_keys=None, view_raw=False,
                  object_hook=None, object_pairs_hook=None, list_hook=None,
                  encoding=None, unicode_errors=None, max_buffer_size=0,
                  ext_hook=ExtType,
@@ -276,8 +326,9 @@ class Unpacker(object):
             self.file_like = file_like
             self._feeding = False
 
-        #: array of bytes fed.
+        #: array of bytes fed, or the memoryview given to reset().
         self._buffer = bytearray()
+        self._in_place = False
         #: Which position we currently reads
         self._buff_i = 0
 
@@ -307,6 +358,11 @@ class Unpacker(object):
         self._read_size = read_size or min(self._max_buffer_size, 16*1024)
         self._raw = bool(raw)
         self._strict_map_key = bool(strict_map_key)
+        self._view_raw = bool(view_raw)
+        if map_keys is None or callable(map_keys):
+            self._map_keys = map_keys
+        else:
+            self._map_keys = frozenset(map_keys).__contains__
         self._encoding = encoding
         self._unicode_errors = unicode_errors
         self._use_list = use_list
@@ -339,6 +395,13 @@ class Unpacker(object):
         if (len(self._buffer) - self._buff_i + len(view) > self._max_buffer_size):
             raise BufferFull
 
+        # Data left over from a buffer read in place has to be copied to grow it
+        if self._in_place:
+            self._buffer = bytearray(self._buffer[self._buf_checkpoint:])
+            self._buff_i -= self._buf_checkpoint
+            self._buf_checkpoint = 0
+            self._in_place = False
+
         # Strip buffer before checkpoint before reading file.
         if self._buf_checkpoint > 0:
             del self._buffer[:self._buf_checkpoint]
@@ -348,6 +411,31 @@ class Unpacker(object):
         # Use extend here: INPLACE_ADD += doesn't reliably typecast memoryview in jython
         self._buffer.extend(view)
 
+    def reset(self, buffer):
+        """
+        Read from `buffer` in place, dropping any data not unpacked yet.
+
+        `buffer` is anything with the buffer protocol (bytes, bytearray,
+        mmap, memoryview); it is not copied, so it must not change while it is
+        being read.  :meth:`tell` counts from its start.  :meth:`feed` may be
+        used afterwards to add more data, which copies what is left of
+        `buffer`.
+        """
+        assert self._feeding
+        view = _get_data_from_buffer(buffer)
+        if len(view) > self._max_buffer_size:
+            raise BufferFull
+        if PY2:
+            # Indexing a memoryview gives 1-byte strings on Python 2
+            self._buffer = bytearray(view)
+            self._in_place = False
+        else:
+            self._buffer = view
+            self._in_place = True
+        self._buff_i = 0
+        self._buf_checkpoint = 0
+        self._stream_offset = 0
+
     def _consume(self):
         """ Gets rid of the used parts of the buffer. """
         self._stream_offset += self._buff_i - self._buf_checkpoint
@@ -357,16 +445,21 @@ class Unpacker(object):
         return self._buff_i < len(self._buffer)
 
     def _get_extradata(self):
+        if self._in_place:
+            # A copy, the caller's buffer may be reused once unpacking is done
+            return bytes(self._buffer[self._buff_i:])
         return self._buffer[self._buff_i:]
 
     def read_bytes(self, n):
         return self._read(n)
 
-    def _read(self, n):
-        # (int) -> bytearray
+    def _read(self, n, execute=EX_CONSTRUCT):
+        # (int) -> bytearray, or None when skipping
         self._reserve(n)
         i = self._buff_i
         self._buff_i = i+n
+        if execute == EX_SKIP:
+            return None
         return self._buffer[i:i+n]
 
     def _reserve(self, n):
@@ -417,7 +510,7 @@ class Unpacker(object):
             typ = TYPE_RAW
             if n > self._max_str_len:
                 raise ValueError("%s exceeds max_str_len(%s)", n, self._max_str_len)
-            obj = self._read(n)
+            obj = self._read(n, execute)
         elif b & 0b11110000 == 0b10010000:
             n = b & 0b00001111
             typ = TYPE_ARRAY
@@ -441,7 +534,7 @@ class Unpacker(object):
             self._buff_i += 1
             if n > self._max_bin_len:
                 raise ValueError("%s exceeds max_bin_len(%s)" % (n, self._max_bin_len))
-            obj = self._read(n)
+            obj = self._read(n, execute)
         elif b == 0xc5:
             typ = TYPE_BIN
             self._reserve(2)
@@ -449,7 +542,7 @@ class Unpacker(object):
             self._buff_i += 2
             if n > self._max_bin_len:
                 raise ValueError("%s exceeds max_bin_len(%s)" % (n, self._max_bin_len))
-            obj = self._read(n)
+            obj = self._read(n, execute)
         elif b == 0xc6:
             typ = TYPE_BIN
             self._reserve(4)
@@ -457,7 +550,7 @@ class Unpacker(object):
             self._buff_i += 4
             if n > self._max_bin_len:
                 raise ValueError("%s exceeds max_bin_len(%s)" % (n, self._max_bin_len))
-            obj = self._read(n)
+            obj = self._read(n, execute)
         elif b == 0xc7:  # ext 8
             typ = TYPE_EXT
             self._reserve(2)
@@ -465,7 +558,7 @@ class Unpacker(object):
             self._buff_i += 2
             if L > self._max_ext_len:
                 raise ValueError("%s exceeds max_ext_len(%s)" % (L, self._max_ext_len))
-            obj = self._read(L)
+            obj = self._read(L, execute)
         elif b == 0xc8:  # ext 16
             typ = TYPE_EXT
             self._reserve(3)
@@ -473,7 +566,7 @@ class Unpacker(object):
             self._buff_i += 3
             if L > self._max_ext_len:
                 raise ValueError("%s exceeds max_ext_len(%s)" % (L, self._max_ext_len))
-            obj = self._read(L)
+            obj = self._read(L, execute)
         elif b == 0xc9:  # ext 32
             typ = TYPE_EXT
             self._reserve(5)
@@ -481,7 +574,7 @@ class Unpacker(object):
             self._buff_i += 5
             if L > self._max_ext_len:
                 raise ValueError("%s exceeds max_ext_len(%s)" % (L, self._max_ext_len))
-            obj = self._read(L)
+            obj = self._read(L, execute)
         elif b == 0xca:
             self._reserve(4)
             obj = _unpack_from(">f", self._buffer, self._buff_i)[0]
@@ -564,7 +657,7 @@ class Unpacker(object):
             self._buff_i += 1
             if n > self._max_str_len:
                 raise ValueError("%s exceeds max_str_len(%s)", n, self._max_str_len)
-            obj = self._read(n)
+            obj = self._read(n, execute)
         elif b == 0xda:
             typ = TYPE_RAW
             self._reserve(2)
@@ -572,7 +665,7 @@ class Unpacker(object):
             self._buff_i += 2
             if n > self._max_str_len:
                 raise ValueError("%s exceeds max_str_len(%s)", n, self._max_str_len)
-            obj = self._read(n)
+            obj = self._read(n, execute)
         elif b == 0xdb:
             typ = TYPE_RAW
             self._reserve(4)
@@ -580,7 +673,7 @@ class Unpacker(object):
             self._buff_i += 4
             if n > self._max_str_len:
                 raise ValueError("%s exceeds max_str_len(%s)", n, self._max_str_len)
-            obj = self._read(n)
+            obj = self._read(n, execute)
         elif b == 0xdc:
             typ = TYPE_ARRAY
             self._reserve(2)
@@ -613,7 +706,7 @@ class Unpacker(object):
             raise FormatError("Unknown header: 0x%x" % b)
         return typ, n, obj
 
-    def _unpack(self, execute=EX_CONSTRUCT):
+    def _unpack(self, execute=EX_CONSTRUCT, nested=False):
         typ, n, obj = self._read_header(execute)
 
         if execute == EX_READ_ARRAY_HEADER:
@@ -629,11 +722,11 @@ class Unpacker(object):
             if execute == EX_SKIP:
                 for i in xrange(n):
                     # TODO check whether we need to call `list_hook`
-                    self._unpack(EX_SKIP)
+                    self._unpack(EX_SKIP, True)
                 return
             ret = newlist_hint(n)
             for i in xrange(n):
-                ret.append(self._unpack(EX_CONSTRUCT))
+                ret.append(self._unpack(EX_CONSTRUCT, True))
             if self._list_hook is not None:
                 ret = self._list_hook(ret)
             # TODO is the interaction between `list_hook` and `use_list` ok?
@@ -642,21 +735,35 @@ class Unpacker(object):
             if execute == EX_SKIP:
                 for i in xrange(n):
                     # TODO check whether we need to call hooks
-                    self._unpack(EX_SKIP)
-                    self._unpack(EX_SKIP)
+                    self._unpack(EX_SKIP, True)
+                    self._unpack(EX_SKIP, True)
                 return
+            keep = None if nested else self._map_keys
+            if keep is not None:
+                pairs = self._unpack_map_pairs(n, keep)
+                if self._object_pairs_hook is not None:
+                    ret = self._object_pairs_hook(pairs)
+                else:
+                    ret = {}
+                    for key, value in pairs:
+                        if self._strict_map_key and type(key) not in (unicode, bytes):
+                            raise ValueError("%s is not allowed for map key" % str(type(key)))
+                        ret[key] = value
+                    if self._object_hook is not None:
+                        ret = self._object_hook(ret)
+                return ret
             if self._object_pairs_hook is not None:
                 ret = self._object_pairs_hook(
-                    (self._unpack(EX_CONSTRUCT),
-                     self._unpack(EX_CONSTRUCT))
+                    (self._unpack_key(),
+                     self._unpack(EX_CONSTRUCT, True))
                     for _ in xrange(n))
             else:
                 ret = {}
                 for _ in xrange(n):
-                    key = self._unpack(EX_CONSTRUCT)
+                    key = self._unpack_key()
                     if self._strict_map_key and type(key) not in (unicode, bytes):
                         raise ValueError("%s is not allowed for map key" % str(type(key)))
-                    ret[key] = self._unpack(EX_CONSTRUCT)
+                    ret[key] = self._unpack(EX_CONSTRUCT, True)
                 if self._object_hook is not None:
                     ret = self._object_hook(ret)
             return ret
@@ -664,19 +771,42 @@ class Unpacker(object):
             return
         if typ == TYPE_RAW:
             if self._encoding is not None:
-                obj = obj.decode(self._encoding, self._unicode_errors)
+                obj = bytes(obj).decode(self._encoding, self._unicode_errors)
             elif self._raw:
-                obj = bytes(obj)
+                obj = obj if self._view_raw and self._in_place else bytes(obj)
             else:
-                obj = obj.decode('utf_8')
+                obj = bytes(obj).decode('utf_8')
             return obj
         if typ == TYPE_EXT:
             return self._ext_hook(n, bytes(obj))
         if typ == TYPE_BIN:
-            return bytes(obj)
+            return obj if self._view_raw and self._in_place else bytes(obj)
         assert typ == TYPE_IMMEDIATE
         return obj
 
+    def _unpack_key(self):
+        # Map keys are never views of the buffer, whatever view_raw says
+        key = self._unpack(EX_CONSTRUCT, True)
+        if type(key) is memoryview:
+            key = bytes(key)
+        return key
+
+    def _unpack_map_pairs(self, n, keep):
+        # The n key/value pairs of a map whose key passes keep(), others are skipped
+        pairs = []
+        for _ in xrange(n):
+            key = self._unpack_key()
+            try:
+                wanted = keep(key)
+            except TypeError:
+                # Unhashable keys are never in the container
+                wanted = False
+            if wanted:
+                pairs.append((key, self._unpack(EX_CONSTRUCT, True)))
+            else:
+                self._unpack(EX_SKIP, True)
+        return pairs
+
     def __iter__(self):
         return self
 
@@ -0,0 +1,81 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Screenshot and video capture names in the album, and an index of them.
+#
+# Captures are stored as Nintendo/Album/YYYY/MM/DD/<time>-<album ID>.<ext>,
+# where time is 16 digits, YYYYMMDDhhmmss and a two digit sequence number, and
+# the album ID is 32 hex digits naming the game. Names are decoded with integer
+# arithmetic, as an SD card can hold tens of thousands of them.
+
+import calendar
+
+
+CAPTURE_EXTENSIONS = (".jpg", ".png", ".mp4")
+# 16 digits, "-", 32 hex digits, ".ext"
+CAPTURE_NAME_LENGTH = 53
+HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+
+
+# (time, album ID) for a capture file name, None if name is not a capture.
+# time is the 16 digit number from the name, which sorts captures in the order
+# they were taken, and the album ID is upper case.
+def capture_info(name):
+    if len(name) != CAPTURE_NAME_LENGTH or name[16] != "-" or name[-4:].lower() not in CAPTURE_EXTENSIONS:
+        return None
+    digits = name[:16]
+    albumId = name[17:49]
+    # isdigit() and int() also take other scripts' digits, signs, spaces and 0x
+    if not all("0" <= c <= "9" for c in digits) or not HEX_DIGITS.issuperset(albumId):
+        return None
+
+    time = int(digits)
+    (_, month, day, hour, minute, second) = time_fields(time)
+    if not (1 <= month <= 12 and 1 <= day <= 31 and hour < 24 and minute < 60 and second < 60):
+        return None
+    return (time, albumId.upper())
+
+
+# (year, month, day, hour, minute, second) of a capture time
+def time_fields(time):
+    (rest, _) = divmod(time, 100)
+    (rest, second) = divmod(rest, 100)
+    (rest, minute) = divmod(rest, 100)
+    (rest, hour) = divmod(rest, 100)
+    (rest, day) = divmod(rest, 100)
+    (year, month) = divmod(rest, 100)
+    return (year, month, day, hour, minute, second)
+
+
+# Seconds since 1970 of a capture time, taking the console's clock as UTC
+def capture_seconds(time):
+    return calendar.timegm(time_fields(time) + (0, 0, 0))
+
+
+# Captures grouped by album ID, each group in the order taken
+class AlbumIndex(object):
+
+    def __init__(self):
+        self.albums = {}
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    # Adds item (anything identifying the file) under name, returns False if
+    # name is not a capture
+    def add(self, name, item):
+        info = capture_info(name)
+        if info is None:
+            return False
+        (time, albumId) = info
+        self.albums.setdefault(albumId, []).append((time, item))
+        self.count += 1
+        return True
+
+    # Yields (album ID, [(time, item), ...]) for each game, captures sorted by time
+    def titles(self):
+        for albumId in sorted(self.albums):
+            captures = self.albums[albumId]
+            captures.sort(key=lambda capture: capture[0])
+            yield (albumId, captures)
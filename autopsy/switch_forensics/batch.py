@@ -0,0 +1,263 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# switch-forensics-batch: runs the parsers over many dumps at once, one dump
+# per process, and writes a result bundle per dump.
+#
+# The manifest lists one dump per line, an extracted NAND folder or a single
+# file, relative to the manifest's folder unless absolute. Blank lines and lines
+# starting with # are skipped. Each dump's bundle is a folder in the output
+# folder, named after the dump and a hash of its full path, so that a dump keeps
+# its bundle however the manifest is reordered or added to. A bundle holds
+#
+#     artifacts.ndjson  every artifact found, as printed by switch-forensics
+#     timeline.ndjson   every artifact with a time, in time order
+#     progress.ndjson   the files parsed so far, the checkpoint
+#     summary.json      written last, once the dump is done
+#
+# A file's artifacts are written and flushed before the file is added to the
+# progress log, so after a crash the artifacts past the last file logged are
+# cut off and the dump carries on from there. Dumps with a summary are skipped.
+#
+# Dumps are independent, so throughput grows with the number of processes,
+# which is one per core unless memory runs out first.
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import multiprocessing
+
+from switch_forensics import pool
+from switch_forensics import timeline
+from switch_forensics.cli import PARSERS
+from switch_forensics.cli import input_files
+from switch_forensics.cli import parse_file
+
+
+ARTIFACTS_FILE = "artifacts.ndjson"
+TIMELINE_FILE = "timeline.ndjson"
+PROGRESS_FILE = "progress.ndjson"
+SUMMARY_FILE = "summary.json"
+
+# Hex digits of the path hash in a bundle folder's name
+BUNDLE_HASH_SIZE = 12
+MEMINFO = "/proc/meminfo"
+
+# Memory one dump may take: a save's files as they are read and the
+# artifacts of one file before they are written
+MEMORY_PER_WORKER = 512 * 1024 * 1024
+
+
+# Dump paths listed in a manifest
+def read_manifest(path):
+    folder = os.path.dirname(os.path.abspath(path))
+    dumps = []
+    with open(path, "r") as manifest:
+        for line in manifest:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                dumps.append(os.path.join(folder, line))
+    return dumps
+
+
+# {dump: bundle folder}, each named after its dump and a hash of the dump's
+# full path, which tells apart dumps with the same name
+def bundle_folders(dumps, output):
+    folders = {}
+    for dump in dumps:
+        path = os.path.normpath(os.path.abspath(dump))
+        name = os.path.basename(path) or "dump"
+        pathHash = hashlib.sha1(path.encode("utf-8")).hexdigest()[:BUNDLE_HASH_SIZE]
+        folders[dump] = os.path.join(output, "%s-%s" % (name, pathHash))
+    return folders
+
+
+# Bytes of memory that can be used without swapping, None where the platform
+# does not say. On Linux that is MemAvailable, which unlike the free pages
+# counts the page cache that can be reclaimed.
+def available_memory(meminfo=MEMINFO):
+    try:
+        with open(meminfo, "r") as info:
+            for line in info:
+                fields = line.split()
+                if fields[:1] == ["MemAvailable:"] and len(fields) >= 2:
+                    # In kB
+                    return int(fields[1]) * 1024
+    except (IOError, OSError, ValueError):
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+# One process per core, fewer if the free memory would not hold them
+def worker_count(dumps):
+    workers = pool.cpu_count()
+    memory = available_memory()
+    if memory is not None:
+        workers = min(workers, memory // MEMORY_PER_WORKER)
+    return int(max(1, min(workers, dumps)))
+
+
+# The entries of a progress log, {file, offset (size of the artifacts file
+# after it) and error if it could not be parsed}. A line cut short by a crash
+# ends the log.
+def read_progress(path):
+    entries = []
+    if os.path.exists(path):
+        with open(path, "r") as progress:
+            for line in progress:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    break
+    return entries
+
+
+def write_progress(progress, entry):
+    progress.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    progress.flush()
+
+
+# Parses one dump into its bundle, carrying on from its checkpoint. Returns
+# the summary, which has "failed" if the dump could not be parsed.
+def run_dump(task):
+    (dump, bundle) = task
+    started = time.time()
+    try:
+        if not os.path.isdir(bundle):
+            os.makedirs(bundle)
+        artifactsPath = os.path.join(bundle, ARTIFACTS_FILE)
+        progressPath = os.path.join(bundle, PROGRESS_FILE)
+
+        entries = read_progress(progressPath)
+        offset = entries[-1]["offset"] if entries else 0
+        if not os.path.exists(artifactsPath) or os.path.getsize(artifactsPath) < offset:
+            # The artifacts never reached the disk, start over
+            (entries, offset) = ([], 0)
+
+        # Only the complete lines are kept, so that appending starts a new line
+        with open(progressPath, "w") as progress:
+            for entry in entries:
+                write_progress(progress, entry)
+        with open(artifactsPath, "ab") as artifacts:
+            artifacts.truncate(offset)
+
+        done = set(entry["file"] for entry in entries)
+        with open(artifactsPath, "ab") as artifacts, open(progressPath, "a") as progress:
+            for path in input_files([dump]):
+                if path in done:
+                    continue
+                entry = {"file": path}
+                try:
+                    for record in parse_file(path, PARSERS):
+                        artifacts.write(json.dumps(record, ensure_ascii=False, sort_keys=True).encode("utf-8") + b"\n")
+                except Exception as e:
+                    entry["error"] = "%s: %s" % (type(e).__name__, e)
+                # Artifacts of a file that failed part way are kept, as switch-forensics prints them
+                artifacts.flush()
+                entry["offset"] = artifacts.tell()
+                write_progress(progress, entry)
+                entries.append(entry)
+
+        summary = {
+            "dump": dump,
+            "files": len(entries),
+            "artifacts": write_timeline(artifactsPath, os.path.join(bundle, TIMELINE_FILE)),
+            "errors": [entry for entry in entries if "error" in entry],
+            "seconds": round(time.time() - started, 1),
+        }
+        write_json(os.path.join(bundle, SUMMARY_FILE), summary)
+        return summary
+    except Exception as e:
+        return {"dump": dump, "failed": "%s: %s" % (type(e).__name__, e)}
+
+
+# Writes the events of the artifacts in an artifacts file in time order,
+# returns the number of artifacts. Events are sorted with bounded memory.
+def write_timeline(artifactsPath, timelinePath):
+    count = [0]
+
+    def events():
+        with open(artifactsPath, "rb") as artifacts:
+            for line in artifacts:
+                record = json.loads(line.decode("utf-8"))
+                count[0] += 1
+                event = timeline.artifact_event(record["artifact"], record["attributes"].items(), record["file"])
+                if event is not None:
+                    yield event
+
+    with open(timelinePath, "w") as out:
+        timeline.write_ndjson(timeline.sort_events(events()), out)
+    return count[0]
+
+
+# Written to a temporary file first, a summary means the dump is done
+def write_json(path, value):
+    temp = path + ".tmp"
+    with open(temp, "w") as out:
+        json.dump(value, out, ensure_ascii=False, indent=1, sort_keys=True)
+    if os.path.exists(path):
+        os.remove(path)
+    os.rename(temp, path)
+
+
+# Each process already has a core, parsers decode on this thread, not a pool
+def single_threaded():
+    pool.WORKERS = 1
+
+
+# Runs every dump not already done, yields the summary of each as it finishes
+def run_batch(dumps, output, workers=None):
+    folders = bundle_folders(dumps, output)
+    tasks = [(dump, folders[dump]) for dump in dumps
+             if not os.path.exists(os.path.join(folders[dump], SUMMARY_FILE))]
+    if not tasks:
+        return
+    if workers is None:
+        workers = worker_count(len(tasks))
+
+    if workers <= 1:
+        for task in tasks:
+            yield run_dump(task)
+        return
+
+    # A fresh process per dump hands its memory back when the dump is done
+    processes = multiprocessing.Pool(workers, initializer=single_threaded, maxtasksperchild=1)
+    try:
+        for summary in processes.imap_unordered(run_dump, tasks):
+            yield summary
+        processes.close()
+    finally:
+        processes.terminate()
+        processes.join()
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(
+        prog="switch-forensics-batch",
+        description="Parse many Nintendo Switch dumps at once, writing a result bundle per dump.")
+    arg_parser.add_argument("manifest", help="file listing one dump folder or file per line")
+    arg_parser.add_argument("-o", "--output", metavar="FOLDER", required=True, help="folder to write the bundles to")
+    arg_parser.add_argument("-w", "--workers", type=int, metavar="N",
+                            help="dumps parsed at once (default: one per core, as memory allows)")
+    args = arg_parser.parse_args(argv)
+
+    dumps = read_manifest(args.manifest)
+    failed = []
+    for summary in run_batch(dumps, args.output, args.workers):
+        if "failed" in summary:
+            failed.append(summary["dump"])
+            sys.stderr.write("switch-forensics-batch: %s: %s\n" % (summary["dump"], summary["failed"]))
+        else:
+            sys.stderr.write("%s: %d artifacts from %d files, %d errors, %.1f s\n" % (
+                summary["dump"], summary["artifacts"], summary["files"], len(summary["errors"]), summary["seconds"]))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Game title lookups used by the Nintendo Switch parsers.
+#
+# game_ids.json maps 16 hex digit title IDs to game names and
+# game_hash_ids.json maps the 32 hex digit IDs found in album file names to
+# game names. Both are read the first time any parser asks for them and then
+# shared, read-only, by every parser and ingest thread in the process.
+#
+# The two tables can also be compiled into game_ids.bin, which is searched in
+# place instead of being parsed into dicts:
+#
+#     python -m switch_forensics.catalog
+#
+# game_ids.bin layout, integers little endian:
+#
+#     header  "NSTITLE1", title count, album count, title table offset,
+#             album table offset, string pool offset, string pool size (u32 each)
+#     titles  8 byte big endian title ID, name offset, name length (u32 each),
+#             sorted by ID
+#     albums  16 byte album ID, name offset, name length (u32 each), sorted by ID
+#     pool    UTF-8 game names, each stored once
+
+import os
+import re
+import sys
+import json
+import hashlib
+import struct
+import binascii
+import threading
+
+try:
+    import mmap
+except ImportError:
+    # Jython has no mmap, the index is read into memory instead
+    mmap = None
+
+
+CATALOG_DIR = os.path.dirname(os.path.abspath(__file__))
+TITLE_IDS_FILE = "game_ids.json"
+ALBUM_IDS_FILE = "game_hash_ids.json"
+INDEX_FILE = "game_ids.bin"
+
+INDEX_MAGIC = b"NSTITLE1"
+INDEX_HEADER = struct.Struct("<8s6I")
+TITLE_ENTRY = struct.Struct("<8sII")
+ALBUM_ENTRY = struct.Struct("<16sII")
+
+
+# {ID: name} from a JSON table whose IDs are all digits hex digits. Raises
+# ValueError naming the IDs that are not, so a typo fails loudly whichever of
+# the JSON tables or game_ids.bin is used.
+def load_ids(path, digits):
+    with open(path, "r") as data_file:
+        ids = json.load(data_file)
+    valid = re.compile("^[0-9A-Fa-f]{%d}$" % digits)
+    invalid = sorted(key for key in ids if not valid.match(key))
+    if invalid:
+        raise ValueError("%s: IDs are not %d hex digits: %s" % (path, digits, ", ".join(invalid)))
+    # Keys are looked up upper case, whatever the case in the file
+    return dict((key.upper(), name) for (key, name) in ids.items())
+
+
+class SwitchCatalog(object):
+
+    _lock = threading.Lock()
+    _instance = None
+
+    # Catalog shared by the whole process, loaded the first time it is asked for.
+    # Uses game_ids.bin unless one of the JSON tables is newer than it. Its
+    # version is the catalog_version() of the tables it was loaded from.
+    # Raises IOError if the tables are missing from the module folder and
+    # ValueError if an ID in them is malformed.
+    @classmethod
+    def getInstance(cls):
+        # Checked once without the lock so that lookups after the first load never wait
+        instance = cls._instance
+        if instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    # Taken before the tables are read, so an edit while they are
+                    # read makes the version out of date rather than too new
+                    version = catalog_version(CATALOG_DIR)
+                    if index_is_current(CATALOG_DIR):
+                        catalog = TitleIndex(os.path.join(CATALOG_DIR, INDEX_FILE))
+                    else:
+                        catalog = cls(CATALOG_DIR)
+                    catalog.version = version
+                    cls._instance = catalog
+                instance = cls._instance
+        return instance
+
+    def __init__(self, path):
+        self.titles = load_ids(os.path.join(path, TITLE_IDS_FILE), 16)
+        self.albums = load_ids(os.path.join(path, ALBUM_IDS_FILE), 32)
+
+    # Game name for a title ID such as 0100000000010000, None if unknown
+    def titleName(self, titleId):
+        return self.titles.get(titleId.upper())
+
+    # Game name for the ID in an album file name, None if unknown
+    def albumName(self, albumId):
+        return self.albums.get(albumId.upper())
+
+
+# Read-only view of game_ids.bin, looked up by binary search over the file
+class TitleIndex(object):
+
+    def __init__(self, path):
+        with open(path, "rb") as index_file:
+            if mmap is not None:
+                self.data = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self.data = index_file.read()
+
+        (magic, self.titleCount, self.albumCount, self.titleOffset, self.albumOffset,
+         self.poolOffset, poolSize) = INDEX_HEADER.unpack_from(self.data, 0)
+        if magic != INDEX_MAGIC:
+            raise IOError("%s is not a title index" % path)
+
+    def titleName(self, titleId):
+        return self.find(titleId, 16, self.titleOffset, self.titleCount, TITLE_ENTRY)
+
+    def albumName(self, albumId):
+        return self.find(albumId, 32, self.albumOffset, self.albumCount, ALBUM_ENTRY)
+
+    def find(self, hexId, digits, tableOffset, count, entry):
+        if len(hexId) != digits:
+            return None
+        try:
+            key = binascii.unhexlify(hexId)
+        except (TypeError, ValueError):
+            return None
+
+        keySize = len(key)
+        lo = 0
+        hi = count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = tableOffset + mid * entry.size
+            candidate = self.data[start:start + keySize]
+            if candidate < key:
+                lo = mid + 1
+            elif candidate > key:
+                hi = mid
+            else:
+                (_, nameOffset, nameLength) = entry.unpack_from(self.data, start)
+                start = self.poolOffset + nameOffset
+                return self.data[start:start + nameLength].decode("utf-8")
+        return None
+
+
+def index_is_current(path):
+    index_path = os.path.join(path, INDEX_FILE)
+    if not os.path.exists(index_path):
+        return False
+    built = os.path.getmtime(index_path)
+    for name in (TITLE_IDS_FILE, ALBUM_IDS_FILE):
+        source = os.path.join(path, name)
+        if os.path.exists(source) and os.path.getmtime(source) > built:
+            return False
+    return True
+
+
+# Changes whenever either JSON table is edited, so results that depend on game
+# names can tell when they are out of date
+def catalog_version(path=CATALOG_DIR):
+    sha = hashlib.sha1()
+    for name in (TITLE_IDS_FILE, ALBUM_IDS_FILE):
+        source = os.path.join(path, name)
+        if os.path.exists(source):
+            sha.update(("%s:%d:%d;" % (name, os.path.getsize(source), int(os.path.getmtime(source)))).encode("ascii"))
+    return sha.hexdigest()[:16]
+
+
+# Compiles the JSON tables in path into game_ids.bin, returns the entry counts.
+# Raises ValueError, writing nothing, if an ID is malformed.
+def build_index(path=CATALOG_DIR):
+    pool = []
+    pool_size = [0]
+    pool_offsets = {}
+
+    def add_name(name):
+        encoded = name.encode("utf-8")
+        if encoded not in pool_offsets:
+            pool_offsets[encoded] = pool_size[0]
+            pool.append(encoded)
+            pool_size[0] += len(encoded)
+        return (pool_offsets[encoded], len(encoded))
+
+    def entries(ids, entry):
+        packed = []
+        for key in sorted(ids):
+            (offset, length) = add_name(ids[key])
+            packed.append(entry.pack(binascii.unhexlify(key), offset, length))
+        return packed
+
+    titles = entries(load_ids(os.path.join(path, TITLE_IDS_FILE), 16), TITLE_ENTRY)
+    albums = entries(load_ids(os.path.join(path, ALBUM_IDS_FILE), 32), ALBUM_ENTRY)
+
+    title_offset = INDEX_HEADER.size
+    album_offset = title_offset + len(titles) * TITLE_ENTRY.size
+    pool_offset = album_offset + len(albums) * ALBUM_ENTRY.size
+    header = INDEX_HEADER.pack(INDEX_MAGIC, len(titles), len(albums), title_offset, album_offset, pool_offset, pool_size[0])
+
+    # Written next to the index and renamed over it, so readers never see half a file
+    index_path = os.path.join(path, INDEX_FILE)
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, "wb") as index_file:
+        index_file.write(header)
+        index_file.write(b"".join(titles))
+        index_file.write(b"".join(albums))
+        index_file.write(b"".join(pool))
+    if os.path.exists(index_path):
+        os.remove(index_path)
+    os.rename(tmp_path, index_path)
+
+    return (len(titles), len(albums))
+
+
+if __name__ == "__main__":
+    try:
+        (titles, albums) = build_index()
+    except ValueError as e:
+        sys.stderr.write("%s\n" % e)
+        sys.exit(1)
+    print("Wrote %s with %d titles and %d album IDs" % (os.path.join(CATALOG_DIR, INDEX_FILE), titles, albums))
@@ -0,0 +1,166 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# switch-forensics: runs the parsers over an extracted NAND folder or a list
+# of files and prints the artifacts found as JSON or CSV, or all events with a
+# time as one timeline in NDJSON.
+#
+# Files are matched on their name and the name of the folder they are in, so
+# SYSTEM/save/8000000000000050 is read as /save/8000000000000050.
+
+import os
+import sys
+import csv
+import json
+import argparse
+
+from switch_forensics import wifi
+from switch_forensics import power_states
+from switch_forensics import crash_dumps
+from switch_forensics import game_history
+from switch_forensics import device_accounts
+from switch_forensics import last_boot
+from switch_forensics import connected_displays
+from switch_forensics import mp_user_history
+from switch_forensics import gamesaves
+from switch_forensics import screenshots
+from switch_forensics import timeline
+from switch_forensics.source import LocalFile
+
+
+PARSERS = [
+    wifi,
+    power_states,
+    crash_dumps,
+    game_history,
+    device_accounts,
+    last_boot,
+    connected_displays,
+    mp_user_history,
+    gamesaves,
+    screenshots,
+]
+
+
+def parser_name(parser):
+    return parser.__name__.split(".")[-1]
+
+
+# Every file under the given paths, folders are walked
+def input_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for (folder, _, names) in os.walk(path):
+                for name in sorted(names):
+                    yield os.path.join(folder, name)
+        else:
+            yield path
+
+
+def parent_path(path):
+    folder = os.path.basename(os.path.dirname(os.path.abspath(path)))
+    return "/%s/" % folder if folder else "/"
+
+
+# Yields a dict per artifact found in path
+def parse_file(path, parsers=PARSERS):
+    source = LocalFile(path, parent_path(path))
+    try:
+        for parser in parsers:
+            if not parser.matches(source):
+                continue
+            for (artifact, attributes) in parser.parse(source):
+                yield {
+                    "file": path,
+                    "parser": parser_name(parser),
+                    "artifact": artifact,
+                    "attributes": dict(attributes),
+                }
+    finally:
+        source.close()
+
+
+# The events in all paths in time order, sorted with bounded memory (see
+# switch_forensics.timeline). Files that cannot be parsed are reported through
+# error(path, exception).
+def timeline_events(paths, parsers=PARSERS, error=None):
+    def events():
+        for path in input_files(paths):
+            source = LocalFile(path, parent_path(path))
+            try:
+                for parser in parsers:
+                    if parser.matches(source):
+                        for event in timeline.file_events(parser, source, path):
+                            yield event
+            except Exception as e:
+                if error is None:
+                    raise
+                error(path, e)
+            finally:
+                source.close()
+
+    return timeline.sort_events(events())
+
+
+def write_json(records, out):
+    out.write("[")
+    for (count, record) in enumerate(records):
+        out.write(",\n" if count else "\n")
+        out.write(json.dumps(record, ensure_ascii=False, sort_keys=True))
+    out.write("\n]\n")
+
+
+# One row per attribute, so every artifact type fits the same columns
+def write_csv(records, out):
+    writer = csv.writer(out)
+    writer.writerow(["file", "parser", "artifact", "attribute", "value"])
+    for record in records:
+        for (attribute, value) in sorted(record["attributes"].items()):
+            writer.writerow([record["file"], record["parser"], record["artifact"], attribute, value])
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(
+        prog="switch-forensics",
+        description="Extract Nintendo Switch artifacts from an extracted NAND folder or save files.")
+    arg_parser.add_argument("paths", nargs="+", metavar="PATH", help="folder to walk or file to parse")
+    arg_parser.add_argument("-f", "--format", choices=["json", "csv"], default="json", help="output format (default: json)")
+    arg_parser.add_argument("-o", "--output", metavar="FILE", help="write to FILE instead of standard output")
+    arg_parser.add_argument("-p", "--parser", action="append", choices=[parser_name(p) for p in PARSERS],
+                            help="only run this parser, may be given more than once")
+    arg_parser.add_argument("-t", "--timeline", action="store_true",
+                            help="print every event with a time in time order, one JSON object per line")
+    args = arg_parser.parse_args(argv)
+
+    parsers = [p for p in PARSERS if not args.parser or parser_name(p) in args.parser]
+    failed = []
+
+    def report(path, e):
+        failed.append(path)
+        sys.stderr.write("switch-forensics: %s: %s\n" % (path, e))
+
+    def records():
+        for path in input_files(args.paths):
+            try:
+                for record in parse_file(path, parsers):
+                    yield record
+            except Exception as e:
+                report(path, e)
+
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        if args.timeline:
+            timeline.write_ndjson(timeline_events(args.paths, parsers, report), out)
+        elif args.format == "csv":
+            write_csv(records(), out)
+        else:
+            write_json(records(), out)
+    finally:
+        if args.output:
+            out.close()
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
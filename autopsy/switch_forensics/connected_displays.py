@@ -0,0 +1,33 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Names of the TVs and monitors the console was docked to, from the EDID blocks
+# kept in the error report save.
+
+import re
+
+from switch_forensics.scanner import scan
+from switch_forensics.source import text
+
+
+ARTIFACT = "TSK_ART_NS_TV"
+KEY = ["TSK_ATT_NS_TV"]
+VERSION = 1
+
+# The monitor name descriptor (tag 0xfc) inside the 128 byte EDID block: up to
+# 13 characters ended by a newline
+DISPLAY_NAME = re.compile(b"EdidBlock.{0,256}?\xfc\x00(.{0,13}?)\n.{0,256}?EdidExtensionBlock", re.DOTALL)
+DISPLAY_NAME_OVERLAP = 1024
+
+
+def matches(source):
+    return source.name == "80000000000000d1"
+
+
+def parse(source):
+    names = set()
+    for (_, display) in scan(source, [DISPLAY_NAME], DISPLAY_NAME_OVERLAP):
+        names.add(text(display.group(1)))
+
+    for tvname in names:
+        yield (ARTIFACT, [("TSK_ATT_NS_TV", tvname)])
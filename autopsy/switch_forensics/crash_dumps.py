@@ -0,0 +1,97 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Error reports kept by the system in the error report save: one msgpack map
+# per report, stored as a file named after the report ID.
+
+import re
+
+from switch_forensics import pool
+from switch_forensics.savefs import SaveDataFileSystem
+from switch_forensics.source import text
+# map_keys is only in the pure Python unpacker
+from switch_forensics._vendor.msgpack.fallback import unpackb
+
+
+ARTIFACT = "TSK_ART_NS_CD"
+KEY = ["TSK_ATT_CD_RID"]
+VERSION = 2
+
+
+def battery_percent(value):
+    return "%.2f%%" % (value / 1000.0)
+
+
+# POSIX seconds, stored as they are
+def posix_time(value):
+    return int(value)
+
+
+# Report key, attribute type, converter from the msgpack value to the attribute
+# value. Keys not listed here are skipped while the report is decoded.
+REPORT_FIELDS = [
+    ("AccessPointSSID", "TSK_ATT_CD_APSSID", text),
+    ("AccessPointSecurityType", "TSK_ATT_CD_APSEC", text),
+    ("ApplicationTitle", "TSK_ATT_CD_APPT", text),
+    ("BatteryChargePercent", "TSK_ATT_CD_BATC", battery_percent),
+    ("ChargeEnabled", "TSK_ATT_CD_CHARGE", text),
+    ("ConnectionStatus", "TSK_ATT_CD_CON", text),
+    ("CurrentIPAddress", "TSK_ATT_CD_IP", text),
+    ("CurrentLanguage", "TSK_ATT_CD_LANG", text),
+    ("CurrentSystemPowerState", "TSK_ATT_CD_CPOWER", text),
+    ("DestinationSystemPowerState", "TSK_ATT_CD_DPOWER", text),
+    ("ElapsedTimeSinceInitialLaunch", "TSK_ATT_CD_LTIME", text),
+    ("ElapsedTimeSinceLastAwake", "TSK_ATT_CD_ATIME", text),
+    ("ElapsedTimeSincePowerOn", "TSK_ATT_CD_PTIME", text),
+    ("ErrorCode", "TSK_ATT_CD_ERRC", text),
+    ("GatewayIPAddress", "TSK_ATT_CD_GIP", text),
+    ("InternalBatteryLotNumber", "TSK_ATT_CD_BATN", text),
+    ("MonitorCurrentHeight", "TSK_ATT_CD_MONH", text),
+    ("MonitorCurrentWidth", "TSK_ATT_CD_MONW", text),
+    ("MonitorManufactureCode", "TSK_ATT_CD_MONM", text),
+    ("MonitorSerialNumber", "TSK_ATT_CD_MONS", text),
+    ("NANDFreeSpace", "TSK_ATT_CD_NFS", text),
+    ("NANDTotalSize", "TSK_ATT_CD_NTS", text),
+    ("NXMacAddress", "TSK_ATT_CD_NXMAC", text),
+    ("OccurrenceTick", "TSK_ATT_CD_OT", text),
+    ("OccurrenceTimestamp", "TSK_ATT_CD_OTS_DATETIME", posix_time),
+    ("OsVersion", "TSK_ATT_CD_OSV", text),
+    ("PriorityDNSIPAddress", "TSK_ATT_CD_DNSP", text),
+    ("RegionSetting", "TSK_ATT_CD_REGION", text),
+    ("ReportIdentifier", "TSK_ATT_CD_RID", text),
+    ("RunningApplicationTitle", "TSK_ATT_CD_RAPPT", text),
+    ("SerialNumber", "TSK_ATT_CD_NXSN", text),
+    ("SubnetMask", "TSK_ATT_CD_NETM", text),
+    ("TimeZone", "TSK_ATT_CD_TZ", text),
+    ("VideoOutputSetting", "TSK_ATT_CD_VOUT", text),
+    ("WirelessAPMacAddress", "TSK_ATT_CD_APMAC", text),
+]
+
+FIELDS = dict((key, (attribute, convert)) for (key, attribute, convert) in REPORT_FIELDS)
+
+REPORT = re.compile(r"/[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+
+
+def matches(source):
+    return source.parentPath.upper() == "/SAVE/" and source.name.upper() == "80000000000000D1"
+
+
+# Reports are read here and decoded on `workers` threads (one per core by default)
+def parse(source, workers=None):
+    save = SaveDataFileSystem(source)
+    reports = (save.read(path) for path in save.paths() if REPORT.match(path))
+    for attributes in pool.imap(decode_report, reports, workers):
+        yield (ARTIFACT, attributes)
+
+
+def decode_report(packed):
+    return report_attributes(unpackb(packed, raw=False, map_keys=FIELDS))
+
+
+def report_attributes(data):
+    attributes = []
+    for (key, value) in data.items():
+        if key in FIELDS:
+            (attribute, convert) = FIELDS[key]
+            attributes.append((attribute, convert(value)))
+    return attributes
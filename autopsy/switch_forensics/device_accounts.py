@@ -0,0 +1,45 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# User accounts on the device, from the account save.
+
+import re
+import json
+
+from switch_forensics.source import chunks
+from switch_forensics.source import text
+
+
+ARTIFACT = "TSK_ART_NS_DEVICE_ACCOUNT"
+KEY = ["TSK_ATT_NS_ACCOUNT_NICKNAME", "TSK_ATT_NS_ACCOUNT_EMAIL"]
+VERSION = 1
+
+# JSON key: attribute type
+ATTRIBUTES = [
+    ("gender", "TSK_ATT_NS_ACCOUNT_GENDER"),
+    ("timezone", "TSK_ATT_NS_ACCOUNT_TIMEZONE"),
+    ("email", "TSK_ATT_NS_ACCOUNT_EMAIL"),
+    ("nickname", "TSK_ATT_NS_ACCOUNT_NICKNAME"),
+    ("isChild", "TSK_ATT_NS_ACCOUNT_ISCHILD"),
+    ("language", "TSK_ATT_NS_ACCOUNT_LANGUAGE"),
+    ("birthday", "TSK_ATT_NS_ACCOUNT_BIRTHDAY"),
+    ("country", "TSK_ATT_NS_ACCOUNT_COUNTRY"),
+    ("isNnLinked", "TSK_ATT_NS_ACCOUNT_ISNNLINKED"),
+    ("isTwitterLinked", "TSK_ATT_NS_ACCOUNT_ISTWITTERLINKED"),
+    ("isFacebookLinked", "TSK_ATT_NS_ACCOUNT_ISFACEBOOKLINKED"),
+    ("isGoogleLinked", "TSK_ATT_NS_ACCOUNT_ISGOOGLELINKED"),
+]
+
+# Each account is a JSON object at the start of a 1024 byte record
+ACCOUNT = re.compile(b"^\\{.*\"gender\".*\\}")
+
+
+def matches(source):
+    return source.name == "8000000000000010"
+
+
+def parse(source):
+    for chunk in chunks(source, 1024):
+        if ACCOUNT.search(chunk):
+            user = json.loads(text(chunk.replace(b"\x00", b"")))
+            yield (ARTIFACT, [(attribute, text(user[key])) for (key, attribute) in ATTRIBUTES])
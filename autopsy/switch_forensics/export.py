@@ -0,0 +1,331 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Bulk export of the Nintendo Switch artifacts of many Autopsy cases, one
+# table per artifact type, so that questions across devices ("which devices
+# saw this SSID") are one query instead of a report per case.
+#
+# The artifacts are read straight from each case database (autopsy.db of a
+# single-user case) and written as Parquet or Arrow IPC files if pyarrow is
+# installed, otherwise as one SQLite database. Every table has the columns
+# case, device, file and artifact_id followed by one column per attribute type,
+# typed as the attribute is: DATETIME as a UTC timestamp in Parquet and Arrow,
+# seconds since 1970 in SQLite.
+#
+# Artifacts are written in batches, a row group each, so memory stays bounded
+# however many cases are exported. This module is for CPython only, Jython has
+# no sqlite3.
+
+import os
+import sys
+import sqlite3
+import argparse
+import itertools
+
+try:
+    from urllib.request import pathname2url
+except ImportError:
+    from urllib import pathname2url
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+from switch_forensics.schema import ARTIFACT_TYPES
+from switch_forensics.source import text
+
+
+CASE_DATABASE = "autopsy.db"
+# Artifacts per row group
+BATCH_SIZE = 10000
+
+# TSK attribute value types
+STRING = 0
+INTEGER = 1
+LONG = 2
+DOUBLE = 3
+BYTE = 4
+DATETIME = 5
+JSON = 6
+
+# Value type: (case database column, SQLite column type)
+VALUE_TYPES = {
+    STRING: ("value_text", "TEXT"),
+    INTEGER: ("value_int32", "INTEGER"),
+    LONG: ("value_int64", "INTEGER"),
+    DOUBLE: ("value_double", "REAL"),
+    BYTE: ("value_byte", "BLOB"),
+    DATETIME: ("value_int64", "INTEGER"),
+    JSON: ("value_text", "TEXT"),
+}
+VALUE_COLUMNS = ("value_text", "value_int32", "value_int64", "value_double", "value_byte")
+
+# Columns every table starts with
+COLUMNS = [("case", STRING), ("device", STRING), ("file", STRING), ("artifact_id", LONG)]
+
+# Attribute type name and value type of each attribute of each Switch artifact type
+COLUMNS_QUERY = """
+SELECT DISTINCT art.type_name, att.type_name, attr.value_type
+FROM blackboard_attributes attr
+JOIN blackboard_artifact_types art ON art.artifact_type_id = attr.artifact_type_id
+JOIN blackboard_attribute_types att ON att.attribute_type_id = attr.attribute_type_id
+WHERE art.type_name IN (%s)
+"""
+
+# The attributes of every artifact of a type, one row each, grouped by artifact
+ATTRIBUTES_QUERY = """
+SELECT a.artifact_id, ds.device_id, f.parent_path, f.name, att.type_name, attr.value_type, %s
+FROM blackboard_artifacts a
+JOIN blackboard_attributes attr ON attr.artifact_id = a.artifact_id
+JOIN blackboard_attribute_types att ON att.attribute_type_id = attr.attribute_type_id
+LEFT JOIN tsk_files f ON f.obj_id = a.obj_id
+LEFT JOIN data_source_info ds ON ds.obj_id = a.data_source_obj_id
+WHERE a.artifact_type_id = (SELECT artifact_type_id FROM blackboard_artifact_types WHERE type_name = ?)
+ORDER BY a.artifact_id
+""" % ", ".join("attr." + column for column in VALUE_COLUMNS)
+
+
+# The case databases under the given paths, each a case folder, a folder of
+# cases or an autopsy.db
+def case_databases(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for (folder, folders, names) in os.walk(path):
+                folders.sort()
+                if CASE_DATABASE in names:
+                    yield os.path.join(folder, CASE_DATABASE)
+        else:
+            yield path
+
+
+# Opened read only, the case may still be open in Autopsy
+def open_case(path):
+    return sqlite3.connect("file:%s?mode=ro" % pathname2url(os.path.abspath(path)), uri=True)
+
+
+def case_name(path):
+    return os.path.basename(os.path.dirname(os.path.abspath(path)))
+
+
+# {artifact type: [(attribute type, value type), ...]} of the Switch artifacts
+# in a case database, attribute types sorted by name
+def case_columns(connection):
+    names = sorted(ARTIFACT_TYPES)
+    columns = {}
+    query = COLUMNS_QUERY % ", ".join("?" * len(names))
+    for (artifactTypeName, attributeTypeName, valueType) in connection.execute(query, names):
+        columns.setdefault(artifactTypeName, {})[attributeTypeName] = valueType
+    return dict((name, sorted(types.items())) for (name, types) in columns.items())
+
+
+# Adds the columns of a case to those of the cases before it. An attribute type
+# stored with different value types in different cases becomes a STRING column.
+def merge_columns(columns, caseColumns):
+    for (artifactTypeName, attributes) in caseColumns.items():
+        known = columns.setdefault(artifactTypeName, {})
+        for (attributeTypeName, valueType) in attributes:
+            if known.get(attributeTypeName, valueType) != valueType:
+                valueType = STRING
+            known[attributeTypeName] = valueType
+
+
+# Rows of the artifacts of one type in a case database, each a tuple of the
+# values of columns, None where an artifact has no such attribute
+def artifact_rows(connection, case, artifactTypeName, columns):
+    positions = dict((name, index) for (index, (name, _)) in enumerate(columns))
+    attributes = connection.execute(ATTRIBUTES_QUERY, (artifactTypeName,))
+    for (artifactId, group) in itertools.groupby(attributes, key=lambda attribute: attribute[0]):
+        row = [None] * len(columns)
+        for attribute in group:
+            (_, device, parentPath, name, attributeTypeName, valueType) = attribute[:6]
+            if row[0] is None:
+                row[0:4] = [case, device, (parentPath or "") + (name or ""), artifactId]
+            index = positions.get(attributeTypeName)
+            if index is None or row[index] is not None:
+                # Not a column, or a repeated attribute type, which keeps its first value
+                continue
+            (valueColumn, _) = VALUE_TYPES.get(valueType, VALUE_TYPES[STRING])
+            value = attribute[6 + VALUE_COLUMNS.index(valueColumn)]
+            if columns[index][1] == STRING and value is not None:
+                value = text(value)
+            row[index] = value
+        yield tuple(row)
+
+
+# One SQLite database, a table per artifact type
+class SqliteWriter(object):
+
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path)
+        # A failed export is written again from the start, it needs no journal
+        self.connection.execute("PRAGMA journal_mode = OFF")
+        self.connection.execute("PRAGMA synchronous = OFF")
+
+    def table(self, artifactTypeName, columns):
+        self.connection.execute("CREATE TABLE %s (%s)" % (quote(artifactTypeName), ", ".join(
+            "%s %s" % (quote(name), VALUE_TYPES[valueType][1]) for (name, valueType) in columns)))
+        return SqliteTable(self.connection, artifactTypeName, columns)
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
+
+
+class SqliteTable(object):
+
+    def __init__(self, connection, artifactTypeName, columns):
+        self.connection = connection
+        self.insert = "INSERT INTO %s VALUES (%s)" % (quote(artifactTypeName), ", ".join("?" * len(columns)))
+
+    def write(self, rows):
+        self.connection.executemany(self.insert, rows)
+        self.connection.commit()
+
+    def close(self):
+        pass
+
+
+def quote(name):
+    return '"%s"' % name.replace('"', '""')
+
+
+# A folder of Parquet or Arrow IPC files, a file per artifact type
+class ArrowWriter(object):
+
+    EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+    def __init__(self, folder, fileFormat="parquet"):
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+        self.folder = folder
+        self.fileFormat = fileFormat
+
+    def table(self, artifactTypeName, columns):
+        path = os.path.join(self.folder, artifactTypeName + self.EXTENSIONS[self.fileFormat])
+        return ArrowTable(path, self.fileFormat, columns)
+
+    def close(self):
+        pass
+
+
+class ArrowTable(object):
+
+    def __init__(self, path, fileFormat, columns):
+        self.schema = pyarrow.schema([(name, arrow_type(valueType)) for (name, valueType) in columns])
+        if fileFormat == "parquet":
+            self.writer = pyarrow.parquet.ParquetWriter(path, self.schema)
+        else:
+            self.writer = pyarrow.ipc.new_file(path, self.schema)
+
+    def write(self, rows):
+        values = list(zip(*rows))
+        arrays = [pyarrow.array(column, type=field.type) for (column, field) in zip(values, self.schema)]
+        batch = pyarrow.RecordBatch.from_arrays(arrays, schema=self.schema)
+        if isinstance(self.writer, pyarrow.parquet.ParquetWriter):
+            self.writer.write_table(pyarrow.Table.from_batches([batch]))
+        else:
+            self.writer.write_batch(batch)
+
+    def close(self):
+        self.writer.close()
+
+
+def arrow_type(valueType):
+    return {
+        INTEGER: pyarrow.int32(),
+        LONG: pyarrow.int64(),
+        DOUBLE: pyarrow.float64(),
+        BYTE: pyarrow.binary(),
+        DATETIME: pyarrow.timestamp("s", tz="UTC"),
+    }.get(valueType, pyarrow.string())
+
+
+# Writes the Switch artifacts of every case database, returns {artifact type:
+# rows written}. Case databases that cannot be read are reported through
+# error(path, exception) and left out.
+def export(databases, writer, batchSize=BATCH_SIZE, error=None):
+    def failed(path, e):
+        if error is None:
+            raise e
+        error(path, e)
+
+    # The columns of every table have to be known before the first row is written
+    columns = {}
+    readable = []
+    for path in databases:
+        try:
+            connection = open_case(path)
+            try:
+                merge_columns(columns, case_columns(connection))
+            finally:
+                connection.close()
+            readable.append(path)
+        except sqlite3.Error as e:
+            failed(path, e)
+    columns = dict((name, COLUMNS + sorted(attributes.items())) for (name, attributes) in columns.items())
+
+    tables = dict((name, writer.table(name, columns[name])) for name in sorted(columns))
+    counts = dict((name, 0) for name in tables)
+    try:
+        for path in readable:
+            connection = open_case(path)
+            try:
+                for (artifactTypeName, table) in sorted(tables.items()):
+                    rows = artifact_rows(connection, case_name(path), artifactTypeName, columns[artifactTypeName])
+                    while True:
+                        batch = list(itertools.islice(rows, batchSize))
+                        if not batch:
+                            break
+                        table.write(batch)
+                        counts[artifactTypeName] += len(batch)
+            except sqlite3.Error as e:
+                failed(path, e)
+            finally:
+                connection.close()
+    finally:
+        for table in tables.values():
+            table.close()
+        writer.close()
+    return counts
+
+
+def main(argv=None):
+    formats = ["parquet", "arrow", "sqlite"] if pyarrow is not None else ["sqlite"]
+    arg_parser = argparse.ArgumentParser(
+        prog="switch-forensics-export",
+        description="Export the Nintendo Switch artifacts of Autopsy cases to one table per artifact type.")
+    arg_parser.add_argument("paths", nargs="+", metavar="PATH", help="case folder, folder of cases or autopsy.db")
+    arg_parser.add_argument("-o", "--output", metavar="PATH", required=True,
+                            help="folder for Parquet or Arrow files, or the SQLite database to create")
+    arg_parser.add_argument("-f", "--format", choices=formats, default=formats[0],
+                            help="output format (default: %s)" % formats[0])
+    args = arg_parser.parse_args(argv)
+
+    if os.path.exists(args.output):
+        arg_parser.error("%s already exists" % args.output)
+
+    failed = []
+
+    def report(path, e):
+        failed.append(path)
+        sys.stderr.write("switch-forensics-export: %s: %s\n" % (path, e))
+
+    if args.format == "sqlite":
+        writer = SqliteWriter(args.output)
+    else:
+        writer = ArrowWriter(args.output, args.format)
+    databases = list(case_databases(args.paths))
+    counts = export(databases, writer, error=report)
+
+    for (artifactTypeName, count) in sorted(counts.items()):
+        sys.stderr.write("%s: %d\n" % (artifactTypeName, count))
+    sys.stderr.write("Exported %d artifacts from %d cases to %s\n" % (
+        sum(counts.values()), len(databases) - len(set(failed)), args.output))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Recently played games, from the play event log save.
+#
+# Each play event is a msgpack map. Starting at its sys_info key, the keys and
+# values are read one msgpack object at a time until the map ends, picking out
+# app_id, event, nc_recorded_at and nsa_id; nested maps are searched too.
+# Events are cut apart at the next sys_info key, so only one event is held in
+# memory at a time.
+
+import numbers
+import binascii
+
+from switch_forensics._vendor import msgpack
+from switch_forensics.catalog import SwitchCatalog
+from switch_forensics.source import parse_time
+from switch_forensics.source import text
+
+
+ARTIFACT = "TSK_ART_NS_RGH"
+KEY = None
+VERSION = 2
+
+EVENT_MARKER = b"\xa8sys_info"
+# Longest event kept, anything after this in one event is dropped
+MAX_EVENT_SIZE = 64 * 1024
+READ_SIZE = 1 << 20
+
+FIELDS = [b"app_id", b"event", b"nc_recorded_at", b"nsa_id"]
+
+
+def matches(source):
+    return source.parentPath.upper() == "/SAVE/" and source.name.upper() == "80000000000000A2"
+
+
+def parse(source):
+    catalog = SwitchCatalog.getInstance()
+
+    for event in events(source):
+        game = catalog.titleName(event["app_id"])
+        if not game:
+            game = "Unknown gameID"
+
+        attributes = [
+            ("TSK_ATT_NS_RGH_GAME", game),
+            ("TSK_ATT_NS_RGS_E", event["event"] or "N/A"),
+        ]
+        # Network clock time, UTC
+        recordedAt = parse_time(event["nc_recorded_at"])
+        if recordedAt is not None:
+            attributes.append(("TSK_ATT_NS_RGS_DATETIME", recordedAt))
+        yield (ARTIFACT, attributes)
+
+
+# Yields a dict per play event with app_id (16 hex digits), event,
+# nc_recorded_at and nsa_id; fields missing from the event are None.
+# Events without an app_id are skipped.
+def events(source):
+    for record in records(source):
+        event = decode_event(record)
+        if event["app_id"]:
+            yield event
+
+
+# The bytes of each event, from its sys_info key up to the next one
+def records(source, readSize=READ_SIZE):
+    window = b""
+    offset = 0
+    start = -1
+
+    while True:
+        chunk = source.read(offset, readSize)
+        offset += len(chunk)
+        window += chunk
+        last = not chunk or offset >= source.size
+
+        if start < 0:
+            start = window.find(EVENT_MARKER)
+            if start < 0:
+                if last:
+                    return
+                # A marker may begin in the last few bytes
+                window = window[-(len(EVENT_MARKER) - 1):]
+                continue
+
+        end = window.find(EVENT_MARKER, start + len(EVENT_MARKER))
+        while end >= 0:
+            yield window[start:end]
+            start = end
+            end = window.find(EVENT_MARKER, start + len(EVENT_MARKER))
+
+        if last:
+            yield window[start:]
+            return
+
+        if len(window) - start > MAX_EVENT_SIZE:
+            yield window[start:start + MAX_EVENT_SIZE]
+            window = window[start + MAX_EVENT_SIZE:]
+            start = -1
+        else:
+            window = window[start:]
+            start = 0
+
+
+def decode_event(record):
+    fields = dict((name, None) for name in FIELDS)
+
+    unpacker = msgpack.Unpacker(raw=True, strict_map_key=False)
+    unpacker.feed(record)
+    try:
+        while True:
+            key = unpacker.unpack()
+            # Anything but a key means the map holding the event has ended
+            if not isinstance(key, bytes):
+                break
+            collect(fields, key, unpacker.unpack())
+    except (msgpack.OutOfData, ValueError, TypeError):
+        # The end of the record, or bytes that are not msgpack
+        pass
+
+    event = {}
+    app_id = fields[b"app_id"]
+    if isinstance(app_id, bytes) and len(app_id) == 8:
+        event["app_id"] = text(binascii.hexlify(app_id)).upper()
+    elif isinstance(app_id, numbers.Integral) and not isinstance(app_id, bool):
+        event["app_id"] = "%016X" % app_id
+    else:
+        event["app_id"] = None
+    for name in (b"event", b"nc_recorded_at", b"nsa_id"):
+        event[text(name)] = text(fields[name]) if fields[name] is not None else None
+    return event
+
+
+# Keeps the first value seen for each field, looking inside nested maps
+def collect(fields, key, value):
+    if key in fields and fields[key] is None and not isinstance(value, (dict, list)):
+        fields[key] = value
+    if isinstance(value, dict):
+        for (nestedKey, nestedValue) in value.items():
+            if isinstance(nestedKey, bytes):
+                collect(fields, nestedKey, nestedValue)
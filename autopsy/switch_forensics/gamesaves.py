@@ -0,0 +1,37 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Game saves, identified by the title ID in the save header.
+
+import binascii
+
+from switch_forensics.catalog import SwitchCatalog
+from switch_forensics.source import text
+
+
+ARTIFACT = "TSK_ART_NS_GS"
+KEY = ["TSK_ATT_NS_GAME"]
+VERSION = 2
+
+# Little endian title ID in the save header
+TITLE_ID_OFFSET = 1752
+
+
+# Currently searches through all save files, regardless of which partition is used. Currently runs very quickly so does not need to be optimised at this point.
+def matches(source):
+    return source.parentPath.upper() == "/SAVE/"
+
+
+def parse(source):
+    data = source.read(TITLE_ID_OFFSET, 8)
+    if len(data) < 8:
+        return
+
+    title_id = text(binascii.hexlify(data[::-1])).upper()
+    game = SwitchCatalog.getInstance().titleName(title_id)
+    if game:
+        yield (ARTIFACT, [
+            ("TSK_ATT_NS_GAME", game),
+            ("TSK_ATT_NS_SAVED_DATETIME", source.mtime),
+            ("TSK_ATT_NS_INFO", "https://ec.nintendo.com/apps/%s/GB" % title_id),
+        ])
@@ -0,0 +1,16 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Last boot time, taken from the modification time of a save written at boot.
+
+ARTIFACT = "TSK_ART_NS_LBOOT"
+KEY = ["TSK_ATT_NS_LBOOT_DATETIME"]
+VERSION = 2
+
+
+def matches(source):
+    return source.name.upper() == "8000000000000060"
+
+
+def parse(source):
+    yield (ARTIFACT, [("TSK_ATT_NS_LBOOT_DATETIME", source.mtime)])
@@ -0,0 +1,197 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Metadata from the headers of album captures: Exif from JPEG screenshots and
+# the movie and track headers from MP4 clips.
+#
+# Only the headers are read. A JPEG is read segment by segment up to the start
+# of the image data, and an MP4 atom by atom, skipping the media data, so a
+# capture costs a few KB of reads however large it is.
+
+import struct
+
+from switch_forensics.source import parse_time
+
+
+# Most bytes read from one header segment or atom
+MAX_HEADER_SIZE = 256 * 1024
+# Seconds between 1904-01-01, the MP4 epoch, and 1970-01-01
+MP4_EPOCH_OFFSET = 2082844800
+
+# Exif tags read from the first IFD and the Exif IFD
+EXIF_MAKE = 0x010F
+EXIF_MODEL = 0x0110
+EXIF_SOFTWARE = 0x0131
+EXIF_DATETIME = 0x0132
+EXIF_IFD = 0x8769
+EXIF_DATETIME_ORIGINAL = 0x9003
+EXIF_WIDTH = 0xA002
+EXIF_HEIGHT = 0xA003
+
+# Bytes per value of each Exif field type
+EXIF_TYPE_SIZES = {1: 1, 2: 1, 3: 2, 4: 4, 5: 8, 7: 1, 9: 4, 10: 8}
+
+# Atoms that only hold other atoms
+MP4_CONTAINERS = (b"moov", b"trak", b"mdia")
+
+
+# A dict of what was found in the capture's headers, possibly empty: width,
+# height, duration (seconds), make, model, software and the time the capture
+# was made, in seconds since 1970: created from a JPEG's Exif, in the console's
+# clock, or created_utc from an MP4's movie header, which is UTC.
+def capture_metadata(source):
+    name = source.name.lower()
+    try:
+        if name.endswith(".mp4"):
+            return mp4_metadata(source)
+        if name.endswith(".jpg"):
+            return jpeg_metadata(source)
+    except (struct.error, ValueError):
+        # Cut short or not what the extension says
+        pass
+    return {}
+
+
+def jpeg_metadata(source):
+    metadata = {}
+    if source.read(0, 2) != b"\xff\xd8":
+        return metadata
+
+    offset = 2
+    while offset + 4 <= source.size:
+        (prefix, marker, length) = struct.unpack(">BBH", source.read(offset, 4))
+        if prefix != 0xFF:
+            break
+        # Fill byte before a marker
+        if marker == 0xFF:
+            offset += 1
+            continue
+        offset += 2
+        # Start of scan, the image data follows
+        if marker == 0xDA or length < 2:
+            break
+        if marker == 0xE1:
+            segment = source.read(offset + 2, min(length - 2, MAX_HEADER_SIZE))
+            if segment[:6] == b"Exif\x00\x00":
+                read_exif(segment[6:], metadata)
+        elif marker in (0xC0, 0xC1, 0xC2):
+            (height, width) = struct.unpack(">xHH", source.read(offset + 2, 5))
+            metadata.setdefault("width", width)
+            metadata.setdefault("height", height)
+        offset += length
+    return metadata
+
+
+def read_exif(tiff, metadata):
+    if tiff[:2] == b"II":
+        order = "<"
+    elif tiff[:2] == b"MM":
+        order = ">"
+    else:
+        return
+    tags = read_ifd(tiff, order, struct.unpack(order + "I", tiff[4:8])[0])
+    if EXIF_IFD in tags:
+        tags.update(read_ifd(tiff, order, tags[EXIF_IFD]))
+
+    for (tag, key) in ((EXIF_MAKE, "make"), (EXIF_MODEL, "model"), (EXIF_SOFTWARE, "software")):
+        if tag in tags:
+            metadata[key] = tags[tag]
+    created = tags.get(EXIF_DATETIME_ORIGINAL, tags.get(EXIF_DATETIME))
+    if created:
+        # Exif writes dates as YYYY:MM:DD HH:MM:SS
+        created = parse_time(created[:10].replace(":", "-") + created[10:])
+        if created is not None:
+            metadata["created"] = created
+    if EXIF_WIDTH in tags and EXIF_HEIGHT in tags:
+        metadata["width"] = tags[EXIF_WIDTH]
+        metadata["height"] = tags[EXIF_HEIGHT]
+
+
+# {tag: value} for the entries of the IFD at offset. Text is decoded, numbers
+# are the first value, and for undefined data the value is its size.
+def read_ifd(tiff, order, offset):
+    tags = {}
+    if offset + 2 > len(tiff):
+        return tags
+    (count,) = struct.unpack_from(order + "H", tiff, offset)
+    for index in range(count):
+        entry = offset + 2 + index * 12
+        if entry + 12 > len(tiff):
+            break
+        (tag, fieldType, valueCount) = struct.unpack_from(order + "HHI", tiff, entry)
+        size = EXIF_TYPE_SIZES.get(fieldType, 1) * valueCount
+        if size > 4:
+            (valueOffset,) = struct.unpack_from(order + "I", tiff, entry + 8)
+        else:
+            valueOffset = entry + 8
+
+        if fieldType == 2:
+            tags[tag] = tiff[valueOffset:valueOffset + size].split(b"\x00")[0].decode("utf-8", "replace").strip()
+        elif fieldType == 3:
+            tags[tag] = struct.unpack_from(order + "H", tiff, valueOffset)[0]
+        elif fieldType == 4:
+            tags[tag] = struct.unpack_from(order + "I", tiff, valueOffset)[0]
+        elif fieldType == 7:
+            tags[tag] = valueCount
+    return tags
+
+
+def mp4_metadata(source):
+    metadata = {}
+    for (atomType, offset, size) in atoms(source, 0, source.size):
+        if atomType == b"moov":
+            read_moov(source.read(offset, min(size, MAX_HEADER_SIZE)), metadata)
+            break
+    return metadata
+
+
+# (type, body offset, body size) of each atom between start and end
+def atoms(source, start, end):
+    offset = start
+    while offset + 8 <= end:
+        (size, atomType) = struct.unpack(">I4s", source.read(offset, 8))
+        header = 8
+        if size == 1:
+            (size,) = struct.unpack(">Q", source.read(offset + 8, 8))
+            header = 16
+        elif size == 0:
+            size = end - offset
+        if size < header:
+            return
+        yield (atomType, offset + header, min(size, end - offset) - header)
+        offset += size
+
+
+# Atoms in a block of bytes already read, same tuples as atoms()
+def block_atoms(data, start, end):
+    offset = start
+    while offset + 8 <= end:
+        (size, atomType) = struct.unpack_from(">I4s", data, offset)
+        if size < 8:
+            return
+        yield (atomType, offset + 8, min(size, end - offset) - 8)
+        offset += size
+
+
+def read_moov(moov, metadata, start=0, end=None):
+    if end is None:
+        end = len(moov)
+    for (atomType, offset, size) in block_atoms(moov, start, end):
+        if atomType in MP4_CONTAINERS:
+            read_moov(moov, metadata, offset, offset + size)
+        elif atomType == b"mvhd":
+            if moov[offset:offset + 1] == b"\x01":
+                (created, _, timescale, duration) = struct.unpack_from(">QQIQ", moov, offset + 4)
+            else:
+                (created, _, timescale, duration) = struct.unpack_from(">IIII", moov, offset + 4)
+            if timescale:
+                metadata["duration"] = float(duration) / timescale
+            # Seconds since 1904 in UTC, unlike Exif times
+            if created > MP4_EPOCH_OFFSET:
+                metadata["created_utc"] = created - MP4_EPOCH_OFFSET
+        elif atomType == b"tkhd" and "width" not in metadata:
+            # Width and height are 16.16 fixed point, at the end of the atom
+            (width, height) = struct.unpack_from(">II", moov, offset + size - 8)
+            if width and height:
+                metadata["width"] = width >> 16
+                metadata["height"] = height >> 16
@@ -0,0 +1,109 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Users played with online and the game played, from history.bin in the
+# friends save.
+#
+# history.bin is an array of 256 byte records:
+#
+#     0x00  16  local user ID
+#     0x10   8  local network account ID
+#     0x18   8  title ID, little endian
+#     0x20   8  time played, POSIX seconds
+#     0x28  56  username of the other player, NUL padded UTF-8
+#     0x60  16  user ID of the other player
+#     0x70 144  unknown
+#
+# records() decodes them one at a time with struct. columns() decodes a whole
+# file into one column per field, with NumPy when it is installed, for jobs
+# that aggregate many saves.
+
+import struct
+import binascii
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from switch_forensics.catalog import SwitchCatalog
+from switch_forensics.savefs import SaveDataFileSystem
+from switch_forensics.source import text
+
+
+ARTIFACT = "TSK_ART_NS_MPH"
+KEY = ["TSK_ATT_MPH_USER", "TSK_ATT_MPH_DATETIME"]
+VERSION = 2
+
+RECORD = struct.Struct("<16sQQQ56s16s144x")
+# Later times are not times, year 10000
+MAX_TIMESTAMP = 253402300800
+RECORD_FIELDS = ["local_user_id", "local_account_id", "title_id", "timestamp", "username", "user_id"]
+
+if numpy is not None:
+    RECORD_DTYPE = numpy.dtype([
+        ("local_user_id", "V16"),
+        ("local_account_id", "<u8"),
+        ("title_id", "<u8"),
+        ("timestamp", "<u8"),
+        ("username", "S56"),
+        ("user_id", "V16"),
+        ("unknown", "V144"),
+    ])
+
+
+def matches(source):
+    return source.parentPath.upper() == "/SAVE/" and source.name.upper() == "0000000000000001"
+
+
+def parse(source):
+    catalog = SwitchCatalog.getInstance()
+    save = SaveDataFileSystem(source)
+    if "/history.bin" not in save.paths():
+        return
+
+    for record in records(save.read("/history.bin")):
+        attributes = [("TSK_ATT_MPH_USER", record["username"])]
+        game = catalog.titleName(record["title_id"])
+        if game:
+            attributes.append(("TSK_ATT_MPH_GAME", game))
+        if record["timestamp"]:
+            attributes.append(("TSK_ATT_MPH_DATETIME", record["timestamp"]))
+        yield (ARTIFACT, attributes)
+
+
+# Yields a dict per record, with the IDs as upper case hex, the username as text
+# and the time played in seconds (None when not set). A short record at the end
+# of the file is ignored.
+def records(data):
+    for offset in range(0, len(data) - RECORD.size + 1, RECORD.size):
+        values = dict(zip(RECORD_FIELDS, RECORD.unpack_from(data, offset)))
+        yield {
+            "local_user_id": hex_id(values["local_user_id"]),
+            "local_account_id": "%016X" % values["local_account_id"],
+            "title_id": "%016X" % values["title_id"],
+            "timestamp": values["timestamp"] if 0 < values["timestamp"] < MAX_TIMESTAMP else None,
+            "username": text(values["username"].split(b"\x00")[0]),
+            "user_id": hex_id(values["user_id"]),
+        }
+
+
+# The records in data as a dict of columns, keyed like records(). With NumPy
+# each column is an array viewing data (IDs and usernames as raw bytes, the
+# rest as uint64), otherwise a list of the undecoded struct values.
+def columns(data):
+    count = len(data) // RECORD.size
+    if numpy is not None:
+        table = numpy.frombuffer(data, dtype=RECORD_DTYPE, count=count)
+        return dict((name, table[name]) for name in RECORD_FIELDS)
+
+    table = dict((name, []) for name in RECORD_FIELDS)
+    for offset in range(0, count * RECORD.size, RECORD.size):
+        for (name, value) in zip(RECORD_FIELDS, RECORD.unpack_from(data, offset)):
+            table[name].append(value)
+    return table
+
+
+def hex_id(value):
+    return text(binascii.hexlify(value)).upper()
+
@@ -0,0 +1,255 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Raw NAND images, as written by memory-dump-utils/DumpNAND.ps1 (rawnand.bin)
+# or in parts by dumpers that write to FAT32 (rawnand.bin.00, .01, ...).
+#
+# The image is memory mapped, part by part, and the parts are read as one
+# storage, so nothing is copied until it is read. The GPT at the start of the
+# image (or its backup at the end) names the partitions: PRODINFO, PRODINFOF,
+# the BCPKG2 packages, SAFE, SYSTEM and USER. Each is a storage of its own, a
+# byte range of the image. The partitions are read as they are stored: PRODINFO,
+# SAFE, SYSTEM and USER are encrypted with the console's BIS keys, which are not
+# used here.
+#
+# Where mmap is missing (Jython) the parts are read as plain files.
+#
+#     python -m switch_forensics.nand rawnand.bin     lists the partitions
+
+import os
+import re
+import sys
+import zlib
+import bisect
+import struct
+
+try:
+    import mmap
+except ImportError:
+    mmap = None
+
+from switch_forensics.savefs import FileStorage
+
+
+SECTOR_SIZE = 512
+GPT_SIGNATURE = b"EFI PART"
+# Signature, revision, header size, header CRC32, reserved, current LBA, backup
+# LBA, first and last usable LBA, disk GUID, first LBA, count, size and CRC32
+# of the partition entries
+GPT_HEADER = struct.Struct("<8sIII4xQQQQ16sQIII")
+# Type GUID, partition GUID, first LBA, last LBA (inclusive), attributes, name
+GPT_ENTRY = struct.Struct("<16s16sQQQ72s")
+MAX_GPT_ENTRIES = 1024
+# The part number at the end of a split image's name
+PART_SUFFIX = re.compile(r"\.(\d{2})$")
+
+
+class NandError(Exception):
+    pass
+
+
+# A file mapped into memory. view() gives the bytes without copying them.
+class MappedFile(object):
+
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        self.size = os.fstat(self.file.fileno()).st_size
+        # An empty file cannot be mapped
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+
+    def read(self, offset, size):
+        return self.map[offset:offset + max(0, size)]
+
+    def view(self, offset, size):
+        return memoryview(self.map)[offset:offset + max(0, size)]
+
+    # Views given out by view() must be released first
+    def close(self):
+        if self.size:
+            self.map.close()
+        self.file.close()
+
+
+class LocalStorage(FileStorage):
+
+    def __init__(self, path):
+        FileStorage.__init__(self, open(path, "rb"))
+
+    def view(self, offset, size):
+        return memoryview(self.read(offset, size))
+
+    def close(self):
+        self.fileobj.close()
+
+
+# Storages read one after the other as one
+class ConcatStorage(object):
+
+    def __init__(self, parts):
+        self.parts = parts
+        self.starts = []
+        self.size = 0
+        for part in parts:
+            self.starts.append(self.size)
+            self.size += part.size
+
+    def read(self, offset, size):
+        return b"".join(bytes(piece) for piece in self.pieces(offset, size, False))
+
+    # Without copying, unless the range spans two parts
+    def view(self, offset, size):
+        pieces = list(self.pieces(offset, size, True))
+        if len(pieces) == 1:
+            return pieces[0]
+        return memoryview(b"".join(bytes(piece) for piece in pieces))
+
+    def pieces(self, offset, size, views):
+        size = max(0, min(size, self.size - offset))
+        while size > 0:
+            index = bisect.bisect_right(self.starts, offset) - 1
+            part = self.parts[index]
+            start = offset - self.starts[index]
+            count = min(size, part.size - start)
+            yield part.view(start, count) if views else part.read(start, count)
+            offset += count
+            size -= count
+
+    def close(self):
+        for part in self.parts:
+            part.close()
+
+
+# A byte range of a storage
+class Partition(object):
+
+    def __init__(self, base, name, offset, size, typeGuid, guid):
+        self.base = base
+        self.name = name
+        self.offset = offset
+        self.size = size
+        self.typeGuid = typeGuid
+        self.guid = guid
+
+    def read(self, offset, size):
+        size = max(0, min(size, self.size - offset))
+        if size == 0:
+            return b""
+        return self.base.read(self.offset + offset, size)
+
+    def view(self, offset, size):
+        size = max(0, min(size, self.size - offset))
+        return self.base.view(self.offset + offset, size)
+
+
+# The files of an image: path itself, or its numbered parts when it was split.
+# Either rawnand.bin or rawnand.bin.00 finds rawnand.bin.00, .01, ...
+def image_parts(path):
+    match = PART_SUFFIX.search(path)
+    if match:
+        base = path[:match.start()]
+    elif os.path.exists(path):
+        return [path]
+    else:
+        base = path
+
+    parts = []
+    while os.path.exists("%s.%02d" % (base, len(parts))):
+        parts.append("%s.%02d" % (base, len(parts)))
+    if not parts:
+        raise NandError("No image at %s" % path)
+    return parts
+
+
+def format_guid(raw):
+    (first, second, third) = struct.unpack_from("<IHH", raw)
+    rest = bytearray(raw[8:16])
+    return "%08X-%04X-%04X-%s-%s" % (first, second, third,
+                                     "".join("%02X" % b for b in rest[:2]), "".join("%02X" % b for b in rest[2:]))
+
+
+# The partitions named in the GPT of a storage, in the order of the table
+def read_gpt(storage):
+    errors = []
+    lastLba = storage.size // SECTOR_SIZE - 1
+    # The backup header is at the last sector, used when the primary is damaged
+    for lba in (1, lastLba):
+        try:
+            return read_gpt_at(storage, lba)
+        except (NandError, struct.error) as e:
+            errors.append("LBA %d: %s" % (lba, e))
+    raise NandError("No valid GPT (%s)" % "; ".join(errors))
+
+
+def read_gpt_at(storage, lba):
+    sector = storage.read(lba * SECTOR_SIZE, SECTOR_SIZE)
+    (signature, _, headerSize, headerCrc, currentLba, _, _, _, _,
+     entriesLba, count, entrySize, entriesCrc) = GPT_HEADER.unpack_from(sector)
+    if signature != GPT_SIGNATURE:
+        raise NandError("No GPT signature")
+    if not GPT_HEADER.size <= headerSize <= SECTOR_SIZE or currentLba != lba:
+        raise NandError("Bad GPT header")
+    header = bytearray(sector[:headerSize])
+    header[16:20] = b"\x00\x00\x00\x00"
+    if zlib.crc32(bytes(header)) & 0xFFFFFFFF != headerCrc:
+        raise NandError("GPT header checksum mismatch")
+    if count > MAX_GPT_ENTRIES or entrySize < GPT_ENTRY.size:
+        raise NandError("Bad GPT entry table")
+
+    table = storage.read(entriesLba * SECTOR_SIZE, count * entrySize)
+    if zlib.crc32(table) & 0xFFFFFFFF != entriesCrc:
+        raise NandError("GPT entry table checksum mismatch")
+
+    partitions = []
+    for index in range(count):
+        (typeGuid, guid, first, last, _, name) = GPT_ENTRY.unpack_from(table, index * entrySize)
+        if typeGuid == b"\x00" * 16:
+            continue
+        name = name.decode("utf-16-le", "replace").split(u"\x00")[0]
+        offset = first * SECTOR_SIZE
+        size = (last - first + 1) * SECTOR_SIZE
+        if last < first or offset + size > storage.size:
+            raise NandError("Partition %s outside the image" % name)
+        partitions.append(Partition(storage, name, offset, size, format_guid(typeGuid), format_guid(guid)))
+    return partitions
+
+
+# A raw NAND image, its parts read as one storage
+class RawNand(object):
+
+    def __init__(self, path):
+        opener = MappedFile if mmap is not None else LocalStorage
+        parts = []
+        try:
+            for part in image_parts(path):
+                parts.append(opener(part))
+            self.storage = ConcatStorage(parts)
+            self.partitions = read_gpt(self.storage)
+        except Exception:
+            for part in parts:
+                part.close()
+            raise
+        self.size = self.storage.size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # The partition called name, such as SYSTEM
+    def partition(self, name):
+        for partition in self.partitions:
+            if partition.name == name:
+                return partition
+        raise NandError("No partition %s" % name)
+
+    def close(self):
+        self.storage.close()
+
+
+if __name__ == "__main__":
+    for path in sys.argv[1:]:
+        with RawNand(path) as nand:
+            print("%s: %d bytes in %d parts" % (path, nand.size, len(nand.storage.parts)))
+            for partition in nand.partitions:
+                print("  %-24s offset 0x%010X  size %12d" % (partition.name, partition.offset, partition.size))
@@ -0,0 +1,109 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# A small thread pool for decoding many records of one file at once.
+#
+# Jython has no global interpreter lock, so inside Autopsy the workers decode
+# on separate cores. Reading stays on the calling thread, since a source is a
+# single seekable stream, and results come back in order, so whoever consumes
+# them (the ingest module posting artifacts) is the only one writing.
+
+import os
+import threading
+from collections import deque
+
+try:
+    from queue import Queue
+except ImportError:
+    from Queue import Queue
+
+
+# Most tasks in flight per worker
+QUEUE_DEPTH = 2
+# Workers imap uses when not given any, None for one per core. Processes that
+# already run one per core, such as the batch runner's, set it to 1.
+WORKERS = None
+
+try:
+    from java.lang import Throwable
+    # What a worker has to catch: Java exceptions from reading a file do not
+    # derive from BaseException
+    FAILURES = (BaseException, Throwable)
+except ImportError:
+    FAILURES = BaseException
+
+
+def cpu_count():
+    count = getattr(os, "cpu_count", lambda: None)()
+    if count:
+        return count
+    try:
+        from java.lang import Runtime
+        return Runtime.getRuntime().availableProcessors()
+    except ImportError:
+        return 1
+
+
+# function(item) for every item, run on up to `workers` threads and yielded
+# in the order of items (WORKERS or one per core if not given). An exception
+# raised by function is raised here when its result is reached. With one
+# worker everything runs on this thread.
+def imap(function, items, workers=None):
+    if workers is None:
+        workers = WORKERS or cpu_count()
+    if workers <= 1:
+        for item in items:
+            yield function(item)
+        return
+
+    tasks = Queue()
+    threads = []
+    for _ in range(workers):
+        thread = threading.Thread(target=work, args=(function, tasks))
+        thread.daemon = True
+        thread.start()
+        threads.append(thread)
+
+    pending = deque()
+    try:
+        for item in items:
+            task = Task(item)
+            tasks.put(task)
+            pending.append(task)
+            if len(pending) >= workers * QUEUE_DEPTH:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for _ in threads:
+            tasks.put(None)
+
+
+class Task(object):
+
+    def __init__(self, item):
+        self.item = item
+        self.value = None
+        self.error = None
+        self.done = threading.Event()
+
+    def result(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+def work(function, tasks):
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        try:
+            task.value = function(task.item)
+        except FAILURES as e:
+            task.error = e
+        finally:
+            # Whatever happened, whoever waits for the result is woken
+            task.item = None
+            task.done.set()
@@ -0,0 +1,35 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Power state changes (sleep, wake, shutdown...) from the play report save.
+
+import re
+
+from switch_forensics.scanner import scan
+from switch_forensics.source import parse_time
+from switch_forensics.source import text
+
+
+ARTIFACT = "TSK_ART_NS_POWER_STATE"
+KEY = ["TSK_ATT_NS_POWER_STATE_DATETIME", "TSK_ATT_NS_POWER_STATE_START", "TSK_ATT_NS_POWER_STATE_STOP"]
+VERSION = 2
+
+STATE_CHANGE = re.compile(b"nc_started_at.(?P<datetime>[0-9: -]{19}).power_state_start.(?P<state_start>[a-zA-Z]{1,64}).power_state_end.(?P<state_end>[a-zA-Z]{1,64})")
+STATE_CHANGE_OVERLAP = 256
+
+
+def matches(source):
+    return source.name.lower() == "80000000000000a1"
+
+
+def parse(source):
+    for (_, state_change) in scan(source, [STATE_CHANGE], STATE_CHANGE_OVERLAP):
+        # Network clock time, UTC
+        timestamp = parse_time(text(state_change.group('datetime')))
+        if timestamp is None:
+            continue
+        yield (ARTIFACT, [
+            ("TSK_ATT_NS_POWER_STATE_DATETIME", timestamp),
+            ("TSK_ATT_NS_POWER_STATE_START", text(state_change.group('state_start'))),
+            ("TSK_ATT_NS_POWER_STATE_STOP", text(state_change.group('state_end'))),
+        ])
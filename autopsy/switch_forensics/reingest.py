@@ -0,0 +1,64 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Which of a file's artifacts an ingest run posts, given what the run before it
+# did with the file. The state itself is kept by switch_state in the case; the
+# choice is made here, apart from Autopsy, so that it also runs on CPython.
+#
+# A file whose content, parser version and game catalog are all as they were is
+# not parsed again. Otherwise its artifacts are parsed and compared by digest
+# with those of the run before:
+#
+#   - the same digest means the same artifact, already posted
+#   - when only the catalog changed, an artifact that came out differently was
+#     renamed by the catalog and is posted, whatever its key says; the artifact
+#     it replaces is stale and stays on the blackboard
+#   - otherwise an artifact is posted unless one with the same key values is
+#     already on the blackboard, or, for parsers without a key, unless the run
+#     before posted it
+
+import hashlib
+
+from switch_forensics.source import text
+
+
+# Short digest of an artifact and its attribute values
+def artifact_digest(artifactTypeName, attributes):
+    sha = hashlib.sha1(artifactTypeName.encode("utf-8"))
+    for (attributeTypeName, value) in sorted(attributes):
+        sha.update(("\x00%s=%s" % (attributeTypeName, text(value))).encode("utf-8"))
+    return sha.hexdigest()[:16]
+
+
+# True if the file and the parser are as they were when previous was saved.
+# fileState holds the file's size, times and digest and the parser version.
+def same_file(previous, fileState):
+    return previous is not None and all(previous.get(name) == value for (name, value) in fileState.items())
+
+
+# Picks the artifacts to post out of those just parsed from a file. previous
+# is the state saved for the file by the run before, None if there was none,
+# and catalogOnly says that the file and parser are unchanged since. key is the
+# parser's KEY, and seen(artifactTypeName, keyValues) says whether an artifact
+# with those key values is already on the blackboard.
+#
+# Returns the artifacts to post, the digests of every artifact parsed, to be
+# saved as the file's state, and the digests of the artifacts posted before
+# that were not parsed again, which are stale.
+def select_artifacts(artifacts, previous, catalogOnly, key, seen):
+    posted = set(previous.get("artifacts", [])) if previous is not None else set()
+    selected = []
+    digests = []
+    for (artifactTypeName, attributes) in artifacts:
+        artifactDigest = artifact_digest(artifactTypeName, attributes)
+        digests.append(artifactDigest)
+        if artifactDigest in posted and (catalogOnly or not key):
+            continue
+        if key and not catalogOnly:
+            values = dict(attributes)
+            if seen(artifactTypeName, tuple([values.get(name) for name in key])):
+                continue
+        selected.append((artifactTypeName, attributes))
+
+    stale = sorted(posted - set(digests)) if catalogOnly else []
+    return (selected, digests, stale)
@@ -0,0 +1,359 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Reader for Nintendo Switch save data images (the files under /save/ on the
+# system and user partitions), so the parsers can read the files inside a save
+# without extracting it with hactoolnet.
+#
+# A save is a stack of storages, each one read through the one below it:
+#
+#     raw image     0x4000 byte header, then the remapped data
+#     data remap    virtual to physical ranges of the image (RMAP)
+#     duplex        two copies of every block, bitmaps pick the current one (DPFS)
+#     meta remap    virtual to physical ranges of the duplex data (RMAP)
+#     journal       virtual to physical block map (JNGL)
+#     IVFC          hash tree over the journal, the last level is the file system data
+#     file system   allocation table plus directory and file tables (SAVE)
+#
+# Hashes and the header CMAC are not checked, the reader only needs the data.
+#
+# Everything reads through objects with a size attribute and a
+# read(offset, size) method returning a byte string, so the same code works on
+# a local file or on an Autopsy AbstractFile.
+
+import bisect
+import struct
+
+
+# Offsets of the headers in the first 0x4000 bytes of the image
+LAYOUT_OFFSET = 0x100
+DUPLEX_HEADER_OFFSET = 0x300
+IVFC_HEADER_OFFSET = 0x344
+JOURNAL_HEADER_OFFSET = 0x408
+SAVE_HEADER_OFFSET = 0x608
+MAIN_REMAP_HEADER_OFFSET = 0x650
+META_REMAP_HEADER_OFFSET = 0x690
+
+# Field offsets in the DISF layout header, all u64
+LAYOUT_FIELDS = {
+    "file_map_entry_offset": 0x28,
+    "file_map_entry_size": 0x30,
+    "meta_map_entry_offset": 0x38,
+    "meta_map_entry_size": 0x40,
+    "file_map_data_offset": 0x48,
+    "file_map_data_size": 0x50,
+    "duplex_l1_offset_a": 0x58,
+    "duplex_l1_offset_b": 0x60,
+    "duplex_l1_size": 0x68,
+    "duplex_data_offset_a": 0x70,
+    "duplex_data_offset_b": 0x78,
+    "duplex_data_size": 0x80,
+    "journal_data_offset": 0x88,
+    "journal_data_size_a": 0x90,
+    "journal_data_size_b": 0x98,
+    "journal_size": 0xA0,
+    "duplex_master_offset_a": 0xA8,
+    "duplex_master_offset_b": 0xB0,
+    "duplex_master_size": 0xB8,
+    "journal_map_table_offset": 0xD8,
+    "journal_map_table_size": 0xE0,
+    "fat_offset": 0x148,
+    "fat_size": 0x150,
+}
+LAYOUT_DUPLEX_INDEX = 0x158
+
+REMAP_ENTRY = struct.Struct("<QQQII")
+# Offset, size and block size power of each of the three duplex levels, after
+# the magic and version of the DPFS header
+DUPLEX_LEVEL = struct.Struct("<QQI")
+FS_ENTRY_SIZE = 0x60
+FS_NAME_SIZE = 0x40
+# Entries 0 and 1 of the directory and file tables head the free and used lists
+FS_USED_LIST_HEAD = 1
+EMPTY_BLOCK = 0xFFFFFFFF
+
+
+class SaveDataError(ValueError):
+    pass
+
+
+def u32(data, offset):
+    return struct.unpack_from("<I", data, offset)[0]
+
+
+def u64(data, offset):
+    return struct.unpack_from("<Q", data, offset)[0]
+
+
+def check_magic(data, offset, magic):
+    if data[offset:offset + 4] != magic:
+        raise SaveDataError("Expected %s header at 0x%x" % (magic.decode("ascii"), offset))
+
+
+# A python file object opened in binary mode
+class FileStorage(object):
+
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        fileobj.seek(0, 2)
+        self.size = fileobj.tell()
+
+    def read(self, offset, size):
+        self.fileobj.seek(offset)
+        return self.fileobj.read(max(0, min(size, self.size - offset)))
+
+
+class SubStorage(object):
+
+    def __init__(self, base, offset, size):
+        self.base = base
+        self.offset = offset
+        self.size = size
+
+    def read(self, offset, size):
+        size = max(0, min(size, self.size - offset))
+        if size == 0:
+            return b""
+        return self.base.read(self.offset + offset, size)
+
+
+# Reads offset..offset+size of a storage made of blocks, locate(block) gives the
+# storage and offset the block is stored at
+def read_blocks(offset, size, total, blockSize, locate):
+    size = max(0, min(size, total - offset))
+    parts = []
+    while size > 0:
+        (block, blockPos) = divmod(offset, blockSize)
+        count = min(size, blockSize - blockPos)
+        (storage, start) = locate(block)
+        parts.append(storage.read(start + blockPos, count))
+        offset += count
+        size -= count
+    return b"".join(parts)
+
+
+class RemapStorage(object):
+
+    def __init__(self, base, header, entries):
+        check_magic(header, 0, b"RMAP")
+        count = u32(header, 0x8)
+        table = entries.read(0, count * REMAP_ENTRY.size)
+
+        self.base = base
+        self.entries = sorted(REMAP_ENTRY.unpack_from(table, i * REMAP_ENTRY.size)[:3] for i in range(count))
+        self.starts = [virtual for (virtual, _, _) in self.entries]
+        self.size = max([virtual + size for (virtual, _, size) in self.entries] or [0])
+
+    def read(self, offset, size):
+        parts = []
+        while size > 0:
+            index = bisect.bisect_right(self.starts, offset) - 1
+            if index < 0:
+                raise SaveDataError("No remap entry for offset 0x%x" % offset)
+            (virtual, physical, length) = self.entries[index]
+            if offset >= virtual + length:
+                raise SaveDataError("No remap entry for offset 0x%x" % offset)
+            count = min(size, virtual + length - offset)
+            parts.append(self.base.read(physical + offset - virtual, count))
+            offset += count
+            size -= count
+        return b"".join(parts)
+
+
+# Two copies of the data, a bit per block picks which copy is current.
+# Bits are read most significant first from little endian 32 bit words.
+class DuplexStorage(object):
+
+    def __init__(self, dataA, dataB, bitmap, blockSize):
+        self.dataA = dataA
+        self.dataB = dataB
+        self.bitmap = bitmap
+        self.blockSize = blockSize
+        self.size = dataA.size
+
+    def isB(self, block):
+        index = (block // 32) * 4 + 3 - (block % 32) // 8
+        if index >= len(self.bitmap):
+            return False
+        return (ord(self.bitmap[index:index + 1]) >> (7 - block % 8)) & 1 == 1
+
+    def read(self, offset, size):
+        return read_blocks(offset, size, self.size, self.blockSize,
+                           lambda block: (self.dataB if self.isB(block) else self.dataA, block * self.blockSize))
+
+
+class JournalStorage(object):
+
+    def __init__(self, base, header, mapTable):
+        check_magic(header, 0, b"JNGL")
+        totalSize = u64(header, 0x8)
+        journalSize = u64(header, 0x10)
+        self.blockSize = u64(header, 0x18)
+        self.size = totalSize - journalSize
+        self.base = base
+
+        # 8 bytes per virtual block, the first u32 is the physical block with a flag in the top bit
+        count = self.size // self.blockSize
+        table = mapTable.read(0, count * 8)
+        self.physical = [value & 0x7FFFFFFF for value in struct.unpack("<%dI" % (count * 2), table)[::2]]
+
+    def read(self, offset, size):
+        return read_blocks(offset, size, self.size, self.blockSize,
+                           lambda block: (self.base, self.physical[block] * self.blockSize))
+
+
+class AllocationTable(object):
+
+    def __init__(self, storage):
+        self.storage = storage
+        self.count = storage.size // 8
+
+    # (first block, block count) of each segment of the chain starting at block
+    def segments(self, block):
+        segments = []
+        while block != -1:
+            if len(segments) > self.count:
+                raise SaveDataError("Allocation table chain does not end")
+            entry = block + 1
+            entries = self.storage.read(entry * 8, 16)
+            (previous, following) = struct.unpack_from("<II", entries, 0)
+            if following & 0x80000000:
+                # Multi-block segment, the following entry holds its last entry index
+                length = u32(entries, 12) - entry + 1
+            else:
+                length = 1
+            segments.append((block, length))
+            following &= 0x7FFFFFFF
+            block = following - 1 if following else -1
+        return segments
+
+
+# A chain of allocation table blocks as one storage
+class AllocationTableStorage(object):
+
+    def __init__(self, base, table, blockSize, block, size=None):
+        self.base = base
+        self.blockSize = blockSize
+        self.blocks = []
+        if block != EMPTY_BLOCK:
+            for (start, length) in table.segments(block):
+                self.blocks.extend(range(start, start + length))
+        self.size = len(self.blocks) * blockSize if size is None else size
+
+    def read(self, offset, size):
+        return read_blocks(offset, size, self.size, self.blockSize,
+                           lambda block: (self.base, self.blocks[block] * self.blockSize))
+
+
+class SaveFile(object):
+
+    def __init__(self, path, block, size):
+        self.path = path
+        self.block = block
+        self.size = size
+
+    def __repr__(self):
+        return "SaveFile(%r, %d bytes)" % (self.path, self.size)
+
+
+class SaveDataFileSystem(object):
+
+    def __init__(self, storage):
+        header = storage.read(0, 0x4000)
+        if len(header) < 0x4000:
+            raise SaveDataError("Save image is smaller than its header")
+        check_magic(header, LAYOUT_OFFSET, b"DISF")
+        check_magic(header, DUPLEX_HEADER_OFFSET, b"DPFS")
+        check_magic(header, IVFC_HEADER_OFFSET, b"IVFC")
+        check_magic(header, SAVE_HEADER_OFFSET, b"SAVE")
+
+        layout = dict((name, u64(header, LAYOUT_OFFSET + offset)) for (name, offset) in LAYOUT_FIELDS.items())
+
+        dataRemap = RemapStorage(
+            SubStorage(storage, layout["file_map_data_offset"], layout["file_map_data_size"]),
+            header[MAIN_REMAP_HEADER_OFFSET:MAIN_REMAP_HEADER_OFFSET + 0x40],
+            SubStorage(storage, layout["file_map_entry_offset"], layout["file_map_entry_size"]))
+
+        # Duplex levels: master bitmap in the header, level 1 bitmap, then the data
+        duplexBlockSizes = [1 << DUPLEX_LEVEL.unpack_from(header, DUPLEX_HEADER_OFFSET + 0x8 + i * DUPLEX_LEVEL.size)[2]
+                            for i in range(3)]
+        if ord(header[LAYOUT_OFFSET + LAYOUT_DUPLEX_INDEX:LAYOUT_OFFSET + LAYOUT_DUPLEX_INDEX + 1]) == 1:
+            masterOffset = layout["duplex_master_offset_b"]
+        else:
+            masterOffset = layout["duplex_master_offset_a"]
+        master = storage.read(masterOffset, layout["duplex_master_size"])
+        level1 = DuplexStorage(
+            SubStorage(dataRemap, layout["duplex_l1_offset_a"], layout["duplex_l1_size"]),
+            SubStorage(dataRemap, layout["duplex_l1_offset_b"], layout["duplex_l1_size"]),
+            master, duplexBlockSizes[1])
+        duplex = DuplexStorage(
+            SubStorage(dataRemap, layout["duplex_data_offset_a"], layout["duplex_data_size"]),
+            SubStorage(dataRemap, layout["duplex_data_offset_b"], layout["duplex_data_size"]),
+            level1.read(0, level1.size), duplexBlockSizes[2])
+
+        metaRemap = RemapStorage(
+            duplex,
+            header[META_REMAP_HEADER_OFFSET:META_REMAP_HEADER_OFFSET + 0x40],
+            SubStorage(storage, layout["meta_map_entry_offset"], layout["meta_map_entry_size"]))
+
+        journal = JournalStorage(
+            SubStorage(dataRemap, layout["journal_data_offset"], layout["journal_data_size_b"] + layout["journal_size"]),
+            header[JOURNAL_HEADER_OFFSET:JOURNAL_HEADER_OFFSET + 0x20],
+            SubStorage(metaRemap, layout["journal_map_table_offset"], layout["journal_map_table_size"]))
+
+        # The last IVFC level holds the file system data, the levels above it only hashes
+        levels = u32(header, IVFC_HEADER_OFFSET + 0xC)
+        dataLevel = IVFC_HEADER_OFFSET + 0x10 + (levels - 2) * 0x18
+        self.data = SubStorage(journal, u64(header, dataLevel), u64(header, dataLevel + 0x8))
+
+        self.blockSize = u64(header, SAVE_HEADER_OFFSET + 0x10)
+        self.table = AllocationTable(SubStorage(metaRemap, layout["fat_offset"], layout["fat_size"]))
+        directoryBlock = u32(header, SAVE_HEADER_OFFSET + 0x40)
+        fileBlock = u32(header, SAVE_HEADER_OFFSET + 0x44)
+
+        self.files = self.readFileTable(
+            self.readTable(AllocationTableStorage(self.data, self.table, self.blockSize, directoryBlock)),
+            self.readTable(AllocationTableStorage(self.data, self.table, self.blockSize, fileBlock)))
+
+    # {index: (parent, name, entry bytes)} for the used entries of a directory or file table
+    def readTable(self, storage):
+        table = storage.read(0, storage.size)
+        entries = {}
+        index = u32(table, FS_USED_LIST_HEAD * FS_ENTRY_SIZE + 0x5C)
+        while index != 0 and index not in entries and (index + 1) * FS_ENTRY_SIZE <= len(table):
+            entry = table[index * FS_ENTRY_SIZE:(index + 1) * FS_ENTRY_SIZE]
+            name = entry[4:4 + FS_NAME_SIZE].split(b"\x00")[0].decode("utf-8", "replace")
+            entries[index] = (u32(entry, 0), name, entry)
+            index = u32(entry, 0x5C)
+        return entries
+
+    def readFileTable(self, directories, files):
+        def path(index, depth=0):
+            if index not in directories or depth > len(directories):
+                return ""
+            (parent, name, _) = directories[index]
+            # The root directory has no name
+            if not name:
+                return ""
+            return path(parent, depth + 1) + "/" + name
+
+        saveFiles = {}
+        for (parent, name, entry) in files.values():
+            filePath = path(parent) + "/" + name
+            saveFiles[filePath] = SaveFile(filePath, u32(entry, 0x48), u64(entry, 0x4C))
+        return saveFiles
+
+    # Paths of all files in the save, such as /history.bin
+    def paths(self):
+        return sorted(self.files.keys())
+
+    # The file at path as a storage, raises KeyError if there is no such file
+    def open(self, path):
+        saveFile = self.files[path]
+        if saveFile.size == 0:
+            return SubStorage(self.data, 0, 0)
+        return AllocationTableStorage(self.data, self.table, self.blockSize, saveFile.block, saveFile.size)
+
+    def read(self, path):
+        fileStorage = self.open(path)
+        return fileStorage.read(0, fileStorage.size)
@@ -0,0 +1,49 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Runs regular expressions over a whole source in one pass, a buffer at a time.
+#
+# Each buffer is searched together with the last `overlap` bytes of the one
+# before it, and a match is only taken once it starts before that tail, so a
+# record split across two reads is still found, and found once. overlap must be
+# at least the longest match any of the patterns can make, so patterns used
+# here have bounded repeats.
+#
+# The window is one bytearray, read into in place and cut from the front as it
+# moves on, so a buffer is not copied again with every read.
+
+BUFFER_SIZE = 1 << 20
+
+
+# Yields (pattern index, match) for every match of every pattern, in order of
+# position for each pattern. Match positions are relative to the current
+# window, so use the groups rather than the offsets. Groups are bytearrays, and
+# are only right until the next match is taken, the window moves under them.
+def scan(source, patterns, overlap, bufferSize=BUFFER_SIZE):
+    window = bytearray()
+    # Source offset of window[0], and of the end of the last match of each pattern
+    base = 0
+    resume = [0] * len(patterns)
+    offset = 0
+
+    while True:
+        chunk = source.read(offset, bufferSize)
+        offset += len(chunk)
+        window.extend(chunk)
+        last = not chunk or offset >= source.size
+
+        # Matches starting in the tail may be cut short, they are taken from the next window
+        limit = len(window) if last else len(window) - overlap
+        for (index, pattern) in enumerate(patterns):
+            for match in pattern.finditer(window, max(0, resume[index] - base)):
+                if match.start() >= limit:
+                    break
+                resume[index] = base + max(match.end(), match.start() + 1)
+                yield (index, match)
+
+        if last:
+            return
+
+        if limit > 0:
+            del window[:limit]
+            base += limit
@@ -0,0 +1,113 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Artifact and attribute types produced by the parsers. The names are the ones
+# used for the custom blackboard types in Autopsy and as keys in the CLI output.
+
+# Artifact type name: display name
+ARTIFACT_TYPES = {
+    "TSK_ART_NS_WIFI": "Nintendo Switch - Wireless Credentials",
+    "TSK_ART_NS_POWER_STATE": "Nintendo Switch - Power State Changes",
+    "TSK_ART_NS_CD": "Nintendo Switch - Crash Dumps",
+    "TSK_ART_NS_RGH": "Nintendo Switch - Recent Game History",
+    "TSK_ART_NS_DEVICE_ACCOUNT": "Nintendo Switch - Device Account",
+    "TSK_ART_NS_LBOOT": "Nintendo Switch - Last Boot Time",
+    "TSK_ART_NS_TV": "Nintendo Switch - Connected Displays",
+    "TSK_ART_NS_MPH": "Nintendo Switch - Multiplayer User History",
+    "TSK_ART_NS_GS": "Nintendo Switch - Game Saves",
+    "TSK_ART_NS_SCREENSHOTS": "Nintendo Switch - Screenshots",
+}
+
+# Attribute type name: (value type, display name)
+#
+# DATETIME values are seconds since 1970, UTC. Where the console wrote a time in
+# its own clock, with no time zone, it is stored as if it were UTC and the
+# display name says so.
+ATTRIBUTE_TYPES = {
+    # Wi-Fi
+    "TSK_ATT_NS_WIFI_SSID": ("STRING", "SSID"),
+    "TSK_ATT_NS_WIFI_PSK": ("STRING", "PSK"),
+
+    # Power states
+    "TSK_ATT_NS_POWER_STATE_DATETIME": ("DATETIME", "Time (UTC)"),
+    "TSK_ATT_NS_POWER_STATE_START": ("STRING", "Power State Start"),
+    "TSK_ATT_NS_POWER_STATE_STOP": ("STRING", "Power State Stop"),
+
+    # Crash dumps
+    "TSK_ATT_CD_APSSID": ("STRING", "Access Point SSID"),
+    "TSK_ATT_CD_APSEC": ("STRING", "Access Point Security Type"),
+    "TSK_ATT_CD_APPT": ("STRING", "Application Title"),
+    "TSK_ATT_CD_BATC": ("STRING", "Battery Charge Percent"),
+    "TSK_ATT_CD_CHARGE": ("STRING", "Charge Enabled"),
+    "TSK_ATT_CD_CON": ("STRING", "Connection Status"),
+    "TSK_ATT_CD_IP": ("STRING", "IP Address"),
+    "TSK_ATT_CD_LANG": ("STRING", "Language"),
+    "TSK_ATT_CD_CPOWER": ("STRING", "Current Power State"),
+    "TSK_ATT_CD_DPOWER": ("STRING", "Destination Power State"),
+    "TSK_ATT_CD_LTIME": ("STRING", "Time Since Launch"),
+    "TSK_ATT_CD_ATIME": ("STRING", "Time Since Last Awake"),
+    "TSK_ATT_CD_PTIME": ("STRING", "Time Since Last Power On"),
+    "TSK_ATT_CD_ERRC": ("STRING", "Error Code"),
+    "TSK_ATT_CD_GIP": ("STRING", "Gateway IP Address"),
+    "TSK_ATT_CD_BATN": ("STRING", "Internal Battery #"),
+    "TSK_ATT_CD_MONH": ("STRING", "Monitor Height"),
+    "TSK_ATT_CD_MONW": ("STRING", "Monitor Width"),
+    "TSK_ATT_CD_MONM": ("STRING", "Monitor Manufacturer"),
+    "TSK_ATT_CD_MONS": ("STRING", "Monitor Serial #"),
+    "TSK_ATT_CD_NFS": ("STRING", "NAND Free Space"),
+    "TSK_ATT_CD_NTS": ("STRING", "NAND Total Size"),
+    "TSK_ATT_CD_NXMAC": ("STRING", "Device MAC Address"),
+    "TSK_ATT_CD_OT": ("STRING", "Occurrence Tick"),
+    "TSK_ATT_CD_OTS_DATETIME": ("DATETIME", "Occurrence Timestamp (UTC)"),
+    "TSK_ATT_CD_OSV": ("STRING", "Os Version"),
+    "TSK_ATT_CD_DNSP": ("STRING", "Priority DNS IP"),
+    "TSK_ATT_CD_REGION": ("STRING", "Device Region"),
+    "TSK_ATT_CD_RID": ("STRING", "Crash Dump ID"),
+    "TSK_ATT_CD_RAPPT": ("STRING", "Running App Title"),
+    "TSK_ATT_CD_NXSN": ("STRING", "Device Serial #"),
+    "TSK_ATT_CD_NETM": ("STRING", "Subnet Mask"),
+    "TSK_ATT_CD_TZ": ("STRING", "Time Zone"),
+    "TSK_ATT_CD_VOUT": ("STRING", "Video Output Setting"),
+    "TSK_ATT_CD_APMAC": ("STRING", "AP MAC Address"),
+
+    # Recent game history
+    "TSK_ATT_NS_RGH_GAME": ("STRING", "Game"),
+    "TSK_ATT_NS_RGS_DATETIME": ("DATETIME", "Time Stamp (UTC)"),
+    "TSK_ATT_NS_RGS_E": ("STRING", "Event"),
+
+    # Device accounts
+    "TSK_ATT_NS_ACCOUNT_GENDER": ("STRING", "Gender"),
+    "TSK_ATT_NS_ACCOUNT_TIMEZONE": ("STRING", "Timezone"),
+    "TSK_ATT_NS_ACCOUNT_EMAIL": ("STRING", "Email"),
+    "TSK_ATT_NS_ACCOUNT_NICKNAME": ("STRING", "Nickname"),
+    "TSK_ATT_NS_ACCOUNT_ISCHILD": ("STRING", "isChild"),
+    "TSK_ATT_NS_ACCOUNT_LANGUAGE": ("STRING", "Language"),
+    "TSK_ATT_NS_ACCOUNT_BIRTHDAY": ("STRING", "Birthday"),
+    "TSK_ATT_NS_ACCOUNT_COUNTRY": ("STRING", "Country"),
+    "TSK_ATT_NS_ACCOUNT_ISNNLINKED": ("STRING", "Linked Nintendo Account"),
+    "TSK_ATT_NS_ACCOUNT_ISTWITTERLINKED": ("STRING", "Linked Twitter Account"),
+    "TSK_ATT_NS_ACCOUNT_ISFACEBOOKLINKED": ("STRING", "Linked Facebook Account"),
+    "TSK_ATT_NS_ACCOUNT_ISGOOGLELINKED": ("STRING", "Linked Google Account"),
+
+    # Last boot
+    "TSK_ATT_NS_LBOOT_DATETIME": ("DATETIME", "Last Boot (UTC, file system)"),
+
+    # Connected displays
+    "TSK_ATT_NS_TV": ("STRING", "Name"),
+
+    # Multiplayer user history
+    "TSK_ATT_MPH_USER": ("STRING", "User"),
+    "TSK_ATT_MPH_GAME": ("STRING", "Game"),
+    "TSK_ATT_MPH_DATETIME": ("DATETIME", "Timestamp (UTC)"),
+
+    # Game saves and screenshots
+    "TSK_ATT_NS_GAME": ("STRING", "Game"),
+    "TSK_ATT_NS_SAVED_DATETIME": ("DATETIME", "Last Saved (UTC, file system)"),
+    "TSK_ATT_NS_INFO": ("STRING", "Game Information"),
+    "TSK_ATT_NS_TAKEN_DATETIME": ("DATETIME", "Taken On (console clock)"),
+    "TSK_ATT_NS_CAPTURE_RES": ("STRING", "Resolution"),
+    "TSK_ATT_NS_CAPTURE_DURATION": ("STRING", "Duration"),
+    "TSK_ATT_NS_CAPTURE_CREATED_DATETIME": ("DATETIME", "Embedded Timestamp (console clock)"),
+    "TSK_ATT_NS_CAPTURE_CREATED_UTC_DATETIME": ("DATETIME", "Embedded Timestamp (UTC)"),
+    "TSK_ATT_NS_CAPTURE_DEVICE": ("STRING", "Device"),
+}
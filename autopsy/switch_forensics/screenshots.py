@@ -0,0 +1,52 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Screenshots and video captures in the album, named after the time they were
+# taken and the game they were taken in, with what their headers say about
+# them (resolution, clip length, embedded time and device).
+
+from switch_forensics.album import capture_info
+from switch_forensics.album import capture_seconds
+from switch_forensics.catalog import SwitchCatalog
+from switch_forensics.media import capture_metadata
+
+
+ARTIFACT = "TSK_ART_NS_SCREENSHOTS"
+KEY = ["TSK_ATT_NS_GAME"]
+VERSION = 4
+
+
+def matches(source):
+    return capture_info(source.name) is not None
+
+
+def parse(source):
+    (time, albumId) = capture_info(source.name)
+    yield (ARTIFACT, capture_attributes(game_name(albumId), time, capture_metadata(source)))
+
+
+def game_name(albumId, catalog=None):
+    game = (catalog or SwitchCatalog.getInstance()).albumName(albumId)
+    if not game:
+        game = "Unknown gameID"
+    return game
+
+
+# metadata is what media.capture_metadata found in the capture's headers
+def capture_attributes(game, time, metadata):
+    attributes = [
+        ("TSK_ATT_NS_GAME", game),
+        ("TSK_ATT_NS_TAKEN_DATETIME", capture_seconds(time)),
+    ]
+    if "width" in metadata and "height" in metadata:
+        attributes.append(("TSK_ATT_NS_CAPTURE_RES", "%dx%d" % (metadata["width"], metadata["height"])))
+    if "duration" in metadata:
+        attributes.append(("TSK_ATT_NS_CAPTURE_DURATION", "%.2f s" % metadata["duration"]))
+    if "created" in metadata:
+        attributes.append(("TSK_ATT_NS_CAPTURE_CREATED_DATETIME", metadata["created"]))
+    if "created_utc" in metadata:
+        attributes.append(("TSK_ATT_NS_CAPTURE_CREATED_UTC_DATETIME", metadata["created_utc"]))
+    device = " ".join(metadata[key] for key in ("make", "model") if metadata.get(key))
+    if device:
+        attributes.append(("TSK_ATT_NS_CAPTURE_DEVICE", device))
+    return attributes
@@ -0,0 +1,87 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Sources for the parsers outside Autopsy, and helpers for reading them.
+
+import os
+import time
+import numbers
+import hashlib
+import calendar
+
+from switch_forensics.savefs import FileStorage
+
+
+# A file on disk. parentPath is the folder the file would be in on the Switch
+# partition, such as /save/.
+class LocalFile(FileStorage):
+
+    def __init__(self, path, parentPath):
+        FileStorage.__init__(self, open(path, "rb"))
+        self.path = path
+        self.name = os.path.basename(path)
+        self.parentPath = parentPath
+        self.mtime = int(os.path.getmtime(path))
+
+    def close(self):
+        self.fileobj.close()
+
+
+# Consecutive size byte pieces of a source
+def chunks(source, size):
+    offset = 0
+    while offset < source.size:
+        yield source.read(offset, size)
+        offset += size
+
+
+# SHA-1 of the size and the first and last DIGEST_SPAN bytes of a source. For a
+# save the first bytes are its header, which holds hashes over all of its data.
+DIGEST_SPAN = 0x10000
+
+
+def digest(source):
+    sha = hashlib.sha1(("%d:" % source.size).encode("ascii"))
+    sha.update(source.read(0, DIGEST_SPAN))
+    if source.size > DIGEST_SPAN:
+        tail = max(DIGEST_SPAN, source.size - DIGEST_SPAN)
+        sha.update(source.read(tail, source.size - tail))
+    return sha.hexdigest()
+
+
+# Time formats other than YYYY-MM-DD HH:MM:SS, with their length
+TIME_FORMATS = [("%H:%M %d/%m/%Y", 16)]
+
+
+# Seconds since 1970 for a time written as text (or already seconds), None if it
+# is not one. A trailing time zone name is ignored, the time is taken as UTC.
+def parse_time(value):
+    if isinstance(value, numbers.Integral) and not isinstance(value, bool):
+        return int(value)
+    if not value:
+        return None
+    value = value.strip()
+    # YYYY-MM-DD HH:MM:SS (or with a T), by far the most common, without strptime
+    if len(value) >= 19 and value[4] == "-" and value[7] == "-" and value[13] == ":" and value[16] == ":":
+        try:
+            return calendar.timegm((int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                                    int(value[11:13]), int(value[14:16]), int(value[17:19]), 0, 0, 0))
+        except ValueError:
+            pass
+    for (fmt, length) in TIME_FORMATS:
+        try:
+            return calendar.timegm(time.strptime(value[:length], fmt))
+        except ValueError:
+            continue
+    if value.isdigit():
+        return int(value)
+    return None
+
+
+# Attribute values are text, whatever the parser decoded
+def text(value):
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode("utf-8", "replace")
+    if isinstance(value, type(u"")):
+        return value
+    return str(value)
@@ -0,0 +1,154 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# One chronological stream of events from every parser that finds something
+# with a time: games played, power state changes, crashes, captures, multiplayer
+# sessions, game saves and the last boot.
+#
+# Events are put in time order with an external merge sort: up to
+# SORT_RUN_SIZE events are sorted in memory, and when there are more, each run
+# of that many is sorted and written to a temporary file and the runs are then
+# merged with a heap, which holds one event per run. Memory stays bounded however
+# many events there are, and no assumption is made about the order the logs
+# were written in.
+#
+# An event is a dict with time (seconds since 1970, UTC), artifact, description,
+# file and the artifact's attributes.
+
+import json
+import heapq
+import time
+import tempfile
+
+from switch_forensics.source import parse_time
+
+
+# Events sorted in memory at once
+SORT_RUN_SIZE = 100000
+
+
+def describe_game_event(values):
+    return "%s: %s" % (values.get("TSK_ATT_NS_RGS_E", "N/A"), values.get("TSK_ATT_NS_RGH_GAME"))
+
+
+def describe_power_state(values):
+    return "Power state %s to %s" % (values.get("TSK_ATT_NS_POWER_STATE_START"), values.get("TSK_ATT_NS_POWER_STATE_STOP"))
+
+
+def describe_crash(values):
+    return "Error %s in %s" % (values.get("TSK_ATT_CD_ERRC"), values.get("TSK_ATT_CD_RAPPT", values.get("TSK_ATT_CD_APPT")))
+
+
+def describe_capture(values):
+    return "Capture in %s" % values.get("TSK_ATT_NS_GAME")
+
+
+def describe_multiplayer(values):
+    return "Played %s with %s" % (values.get("TSK_ATT_MPH_GAME", "unknown game"), values.get("TSK_ATT_MPH_USER"))
+
+
+def describe_last_boot(values):
+    return "Last boot"
+
+
+def describe_game_save(values):
+    return "Saved %s" % values.get("TSK_ATT_NS_GAME")
+
+
+# Artifact type: (attribute types holding the time, most precise first, description)
+EVENT_TYPES = {
+    "TSK_ART_NS_RGH": (["TSK_ATT_NS_RGS_DATETIME"], describe_game_event),
+    "TSK_ART_NS_POWER_STATE": (["TSK_ATT_NS_POWER_STATE_DATETIME"], describe_power_state),
+    "TSK_ART_NS_CD": (["TSK_ATT_CD_OTS_DATETIME"], describe_crash),
+    "TSK_ART_NS_SCREENSHOTS": (["TSK_ATT_NS_CAPTURE_CREATED_UTC_DATETIME", "TSK_ATT_NS_CAPTURE_CREATED_DATETIME",
+                                "TSK_ATT_NS_TAKEN_DATETIME"], describe_capture),
+    "TSK_ART_NS_MPH": (["TSK_ATT_MPH_DATETIME"], describe_multiplayer),
+    "TSK_ART_NS_LBOOT": (["TSK_ATT_NS_LBOOT_DATETIME"], describe_last_boot),
+    "TSK_ART_NS_GS": (["TSK_ATT_NS_SAVED_DATETIME"], describe_game_save),
+}
+
+
+# The event for an artifact, None if it has no time
+def artifact_event(artifactTypeName, attributes, path):
+    if artifactTypeName not in EVENT_TYPES:
+        return None
+    (timeAttributes, describe) = EVENT_TYPES[artifactTypeName]
+    values = dict(attributes)
+    for name in timeAttributes:
+        seconds = parse_time(values.get(name))
+        if seconds is not None:
+            return {
+                "time": seconds,
+                "artifact": artifactTypeName,
+                "description": describe(values),
+                "file": path,
+                "attributes": values,
+            }
+    return None
+
+
+# The events parser finds in source, in the order found
+def file_events(parser, source, path):
+    for (artifactTypeName, attributes) in parser.parse(source):
+        event = artifact_event(artifactTypeName, attributes, path)
+        if event is not None:
+            yield event
+
+
+# All events in time order, events with the same time in the order given
+def sort_events(events, runSize=SORT_RUN_SIZE):
+    runs = []
+    run = []
+    try:
+        for event in events:
+            run.append(event)
+            if len(run) >= runSize:
+                runs.append(spill(run))
+                run = []
+        run.sort(key=lambda event: event["time"])
+        if not runs:
+            for event in run:
+                yield event
+            return
+        for event in merge([read_run(runFile) for runFile in runs] + [iter(run)]):
+            yield event
+    finally:
+        for runFile in runs:
+            runFile.close()
+
+
+# A run of events sorted and written to a temporary file, one JSON object per
+# line, which is deleted when closed
+def spill(run):
+    run.sort(key=lambda event: event["time"])
+    runFile = tempfile.TemporaryFile(mode="w+")
+    for event in run:
+        runFile.write(json.dumps(event, sort_keys=True))
+        runFile.write("\n")
+    runFile.seek(0)
+    return runFile
+
+
+def read_run(runFile):
+    for line in runFile:
+        yield json.loads(line)
+
+
+# One stream of the events of every stream, in time order. Each stream must be
+# sorted by time; only one event of each is held at a time.
+def merge(streams):
+    def keyed(index, events):
+        for (count, event) in enumerate(events):
+            yield (event["time"], index, count, event)
+
+    for (_, _, _, event) in heapq.merge(*[keyed(index, events) for (index, events) in enumerate(streams)]):
+        yield event
+
+
+# One JSON object per line, time as seconds and as text
+def write_ndjson(events, out):
+    for event in events:
+        record = dict(event)
+        record["utc"] = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(event["time"]))
+        out.write(json.dumps(record, ensure_ascii=False, sort_keys=True))
+        out.write("\n")
@@ -0,0 +1,34 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Wi-Fi networks and their passphrases, from the system settings save.
+
+import re
+
+from switch_forensics.scanner import scan
+from switch_forensics.source import text
+
+
+ARTIFACT = "TSK_ART_NS_WIFI"
+KEY = ["TSK_ATT_NS_WIFI_SSID"]
+VERSION = 1
+
+# SSIDs are at most 32 characters and passphrases at most 64
+NETWORK = re.compile(b"\x00[^\x00]{16}\x03(?:[^\x20-\x7f]{1,256})(?P<ssid>[\x20-\x7f]{1,32}?)\x00(?:[^\x20-\x7f]{1,256})(?P<pass>[\x20-\x7f]{1,64}?)\x00")
+NETWORK_OVERLAP = 1024
+
+
+def matches(source):
+    return source.name.lower() == "8000000000000050"
+
+
+def parse(source):
+    networks = {}
+    for (_, network) in scan(source, [NETWORK], NETWORK_OVERLAP):
+        networks[text(network.group('ssid'))] = text(network.group('pass'))
+
+    for (ssid, psk) in networks.items():
+        yield (ARTIFACT, [
+            ("TSK_ATT_NS_WIFI_SSID", ssid),
+            ("TSK_ATT_NS_WIFI_PSK", psk),
+        ])
@@ -0,0 +1,174 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Runs a parser from switch_forensics as part of the Nintendo Switch ingest
+# module. The ingest_*.py modules only say which parser to run and how to label
+# its results; reading the file, skipping artifacts already on the blackboard
+# and posting the rest is done here.
+
+import inspect
+from jarray import zeros
+from java.util.logging import Level
+from org.sleuthkit.datamodel import ReadContentInputStream
+from org.sleuthkit.datamodel import TskData
+from org.sleuthkit.autopsy.ingest import IngestModule
+from org.sleuthkit.autopsy.ingest.IngestModule import IngestModuleException
+from org.sleuthkit.autopsy.ingest import IngestMessage
+from org.sleuthkit.autopsy.ingest import IngestServices
+
+from switch_blackboard import ArtifactBatch
+from switch_blackboard import ArtifactKeys
+from switch_state import IngestState
+from switch_types import SwitchTypes
+from switch_forensics.catalog import SwitchCatalog
+from switch_forensics.reingest import same_file
+from switch_forensics.reingest import select_artifacts
+from switch_forensics.savefs import SaveDataError
+from switch_forensics.source import digest
+from switch_forensics.timeline import artifact_event
+
+
+# An AbstractFile as a parser source, read in place through ReadContentInputStream
+class ContentFile(object):
+
+    def __init__(self, file):
+        self.stream = ReadContentInputStream(file)
+        self.size = file.getSize()
+        self.name = file.getName()
+        self.parentPath = file.getParentPath()
+        self.mtime = file.getMtime()
+
+    def read(self, offset, size):
+        size = max(0, min(size, self.size - offset))
+        buf = zeros(size, 'b')
+        self.stream.seek(offset)
+        done = 0
+        while done < size:
+            count = self.stream.read(buf, done, size - done)
+            if count <= 0:
+                break
+            done += count
+        return buf.tostring()[:done]
+
+
+class SwitchParserModule(object):
+
+    moduleName = None
+    # (file name, parent path substring) searched for by ingest_switch
+    FILE_QUERIES = []
+    # Parser module from switch_forensics
+    parser = None
+    # TSK_SET_NAME of the artifacts posted
+    setName = None
+    # Index the artifacts for keyword search where postArtifacts, which always
+    # does, is missing
+    index = False
+    # Parser looks up game names
+    needsCatalog = False
+    # Ingest inbox message, after the number of files found
+    foundMessage = "files found"
+
+    def log(self, level, msg):
+        self._logger.logp(level, self.__class__.__name__, inspect.stack()[1][3], msg)
+
+    def startUp(self, context):
+        self.filesFound = 0
+
+        self.types = SwitchTypes.getInstance()
+        self.state = IngestState.getInstance()
+
+        self.catalogVersion = None
+        if self.needsCatalog:
+            try:
+                catalog = SwitchCatalog.getInstance()
+            except IOError:
+                raise IngestModuleException("game_ids.json or game_hash_ids.json was not found in module folder")
+            except ValueError as e:
+                raise IngestModuleException(str(e))
+            # The catalog stays loaded for the whole process, edits to the tables
+            # made since do not count
+            self.catalogVersion = catalog.version
+
+        pass
+
+    # False for unallocated and unused blocks and for anything that is not a file
+    def isFile(self, file):
+        return not ((file.getType() == TskData.TSK_DB_FILES_TYPE_ENUM.UNALLOC_BLOCKS)
+                    or (file.getType() == TskData.TSK_DB_FILES_TYPE_ENUM.UNUSED_BLOCKS)
+                    or (file.isFile() is False))
+
+    def process(self, file):
+
+        # Skip non-files
+        if not self.isFile(file):
+            return IngestModule.ProcessResult.OK
+
+        source = ContentFile(file)
+        if not self.parser.matches(source):
+            return IngestModule.ProcessResult.OK
+
+        self.log(Level.INFO, "Found the file " + file.getName())
+        self.filesFound += 1
+
+        # Skip the file if neither it nor the parser nor the game catalog changed
+        # since it was last parsed, see switch_forensics.reingest
+        fileState = {
+            "size": file.getSize(),
+            "mtime": file.getMtime(),
+            "crtime": file.getCrtime(),
+            "digest": digest(source),
+            "version": self.parser.VERSION,
+        }
+        previous = self.state.get(self.moduleName, file.getId())
+        unchanged = same_file(previous, fileState)
+        if unchanged and previous.get("catalog") == self.catalogVersion:
+            self.log(Level.INFO, "Skipping unchanged file " + file.getName())
+            return IngestModule.ProcessResult.OK
+
+        try:
+            artifacts = list(self.parser.parse(source))
+        except SaveDataError as e:
+            self.log(Level.WARNING, "Could not read save %s: %s" % (file.getName(), e))
+            return IngestModule.ProcessResult.OK
+
+        # Don't add to blackboard if the artifact already exists
+        existing = {}
+
+        def seen(artifactTypeName, keyValues):
+            if artifactTypeName not in existing:
+                existing[artifactTypeName] = ArtifactKeys(file, artifactTypeName, self.parser.KEY, self.types)
+            return existing[artifactTypeName].seen(keyValues)
+
+        (selected, digests, stale) = select_artifacts(artifacts, previous, unchanged, self.parser.KEY, seen)
+        batch = ArtifactBatch(file, self.moduleName, self.setName, self.types, index=self.index)
+        for (artifactTypeName, attributes) in selected:
+            batch.add(artifactTypeName, self.postedAttributes(artifactTypeName, attributes))
+        batch.commit()
+        if stale:
+            self.log(Level.INFO, "%d artifacts of %s were renamed by the game catalog, the %d posted before them are stale"
+                     % (len(selected), file.getName(), len(stale)))
+
+        fileState["catalog"] = self.catalogVersion
+        fileState["artifacts"] = digests
+        self.state.put(self.moduleName, file.getId(), fileState)
+
+        return IngestModule.ProcessResult.OK
+
+    # The attributes to post for an artifact: those parsed and, if it has a time
+    # (see switch_forensics.timeline), that time as TSK_DATETIME, which is the
+    # attribute postArtifacts puts custom artifact types on the timeline by
+    def postedAttributes(self, artifactTypeName, attributes):
+        event = artifact_event(artifactTypeName, attributes, None)
+        if event is None:
+            return attributes
+        return list(attributes) + [("TSK_DATETIME", event["time"])]
+
+    # Called by ingest_switch once every file of a data source has been through
+    # process(), for modules that post their artifacts all together
+    def flush(self):
+        pass
+
+    def shutDown(self):
+        message = IngestMessage.createMessage(
+            IngestMessage.MessageType.DATA, self.moduleName, str(self.filesFound) + " " + self.foundMessage)
+        _ = IngestServices.getInstance().postMessage(message)
@@ -0,0 +1,97 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# What the Nintendo Switch parsers did with each file on earlier ingest runs,
+# kept in the case so that a re-run can tell which files changed.
+#
+# For each module and file object ID the state holds the file's size, times and
+# content digest, the parser version, the game catalog version the artifacts
+# were named with and digests of the artifacts the parser produced, which
+# switch_forensics.reingest compares with those of the next run. It is kept
+# as JSON in the case module folder. Updates are held in memory and written
+# once per data source, replacing the old file in one move.
+
+import os
+import json
+import threading
+from java.io import IOException
+from java.nio.file import Files
+from java.nio.file import Paths
+from java.nio.file import StandardCopyOption
+from java.nio.file import AtomicMoveNotSupportedException
+from java.util.logging import Level
+from org.sleuthkit.autopsy.coreutils import Logger
+from org.sleuthkit.autopsy.casemodule import Case
+
+
+STATE_FOLDER = "Nintendo Switch"
+STATE_FILE = "ingest_state.json"
+
+
+class IngestState(object):
+
+    _logger = Logger.getLogger("Nintendo Switch")
+    _lock = threading.RLock()
+    _instance = None
+
+    # State of the currently open case, read the first time it is asked for
+    @classmethod
+    def getInstance(cls):
+        folder = os.path.join(Case.getCurrentCase().getModuleDirectory(), STATE_FOLDER)
+        with cls._lock:
+            if cls._instance is None or cls._instance.folder != folder:
+                cls._instance = cls(folder)
+            return cls._instance
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.path = os.path.join(folder, STATE_FILE)
+        self.lock = threading.Lock()
+        self.files = {}
+        self.changed = False
+
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r") as state_file:
+                    self.files = json.load(state_file)
+            except (IOError, ValueError):
+                # Unreadable state only means every file is parsed again
+                self._logger.log(Level.WARNING, "Could not read " + self.path)
+
+    # The entry saved for a file by a module, None if it was never processed
+    def get(self, moduleName, objId):
+        with self.lock:
+            return self.files.get("%s/%d" % (moduleName, objId))
+
+    # Held until save()
+    def put(self, moduleName, objId, entry):
+        with self.lock:
+            self.files["%s/%d" % (moduleName, objId)] = entry
+            self.changed = True
+
+    # Written to a temporary file that then replaces the state in one move, so
+    # that a crash leaves either the old state or the new one
+    def save(self):
+        with self.lock:
+            if not self.changed:
+                return
+            temp = self.path + ".tmp"
+            try:
+                if not os.path.isdir(self.folder):
+                    os.makedirs(self.folder)
+                with open(temp, "w") as state_file:
+                    json.dump(self.files, state_file)
+                replace(temp, self.path)
+                self.changed = False
+            except (IOError, OSError, IOException) as e:
+                self._logger.log(Level.WARNING, "Could not save %s: %s" % (self.path, e))
+
+
+# Moves temp over path, atomically where the file system can
+def replace(temp, path):
+    (source, target) = (Paths.get(temp), Paths.get(path))
+    try:
+        Files.move(source, target, StandardCopyOption.REPLACE_EXISTING, StandardCopyOption.ATOMIC_MOVE)
+    except AtomicMoveNotSupportedException:
+        # The old state is still in place until the new one replaces it
+        Files.move(source, target, StandardCopyOption.REPLACE_EXISTING)
@@ -0,0 +1,82 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Artifact and attribute types used by the Nintendo Switch parsers.
+#
+# The custom types are declared in switch_forensics.schema. They are created in
+# the case database the first time a parser starts up on a case, and every later
+# parser, ingest thread and ingest job working on that case reuses the handles
+# looked up then.
+
+import threading
+from java.util.logging import Level
+from org.sleuthkit.datamodel import BlackboardAttribute
+from org.sleuthkit.autopsy.coreutils import Logger
+from org.sleuthkit.autopsy.casemodule import Case
+
+from switch_forensics.schema import ARTIFACT_TYPES
+from switch_forensics.schema import ATTRIBUTE_TYPES
+
+
+# Attribute value type names used in the schema
+VALUE_TYPES = {
+    "STRING": BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING,
+    "DATETIME": BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.DATETIME,
+}
+
+
+class SwitchTypes(object):
+
+    _logger = Logger.getLogger("Nintendo Switch")
+    _lock = threading.RLock()
+    _instance = None
+
+    # Registry for the currently open case, created the first time it is asked for
+    @classmethod
+    def getInstance(cls):
+        skCase = Case.getCurrentCase().getSleuthkitCase()
+        with cls._lock:
+            if cls._instance is None or cls._instance.skCase != skCase:
+                cls._instance = cls(skCase)
+            return cls._instance
+
+    def __init__(self, skCase):
+        self.skCase = skCase
+        self.artifactTypes = {}
+        self.attributeTypes = {}
+
+        # Only add the types that are missing, so reopening a case writes nothing
+        for name, displayName in ARTIFACT_TYPES.items():
+            artifactType = skCase.getArtifactType(name)
+            if artifactType is None:
+                try:
+                    artifactType = skCase.addBlackboardArtifactType(name, displayName)
+                except:
+                    # Created by another Autopsy instance sharing the case
+                    self._logger.log(Level.INFO, "Artifact Creation Error: %s" % name)
+                    artifactType = skCase.getArtifactType(name)
+            self.artifactTypes[name] = artifactType
+
+        for name, (valueType, displayName) in ATTRIBUTE_TYPES.items():
+            attributeType = skCase.getAttributeType(name)
+            if attributeType is None:
+                try:
+                    attributeType = skCase.addArtifactAttributeType(name, VALUE_TYPES[valueType], displayName)
+                except:
+                    self._logger.log(Level.INFO, "Attribute Creation Error: %s" % name)
+                    attributeType = skCase.getAttributeType(name)
+            self.attributeTypes[name] = attributeType
+
+    # Standard types such as TSK_DATETIME are looked up the first time they are used
+    def artifactType(self, name):
+        if name not in self.artifactTypes:
+            self.artifactTypes[name] = self.skCase.getArtifactType(name)
+        return self.artifactTypes[name]
+
+    def artifactTypeID(self, name):
+        return self.artifactType(name).getTypeID()
+
+    def attributeType(self, name):
+        if name not in self.attributeTypes:
+            self.attributeTypes[name] = self.skCase.getAttributeType(name)
+        return self.attributeTypes[name]
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+
+# The switch_forensics package lives under autopsy/, next to the Jython ingest
+# modules, and is imported from there so the tests run without installing it.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "autopsy"))
+
+
+# A source held in memory, read the way parsers read an Autopsy file
+class MemorySource(object):
+
+    def __init__(self, name, data, parentPath="/"):
+        self.name = name
+        self.parentPath = parentPath
+        self.data = data
+        self.size = len(data)
+        self.mtime = 0
+
+    def read(self, offset, size):
+        return self.data[offset:offset + max(0, size)]
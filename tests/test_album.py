@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+import calendar
+
+import pytest
+
+from conftest import MemorySource
+from switch_forensics import album
+from switch_forensics import screenshots
+
+
+ALBUM_ID = "57B4628D2267231D57E0FC1078C0596D"
+NAME = "2020050110300500-" + ALBUM_ID + ".jpg"
+
+
+def test_capture_info():
+    assert album.capture_info(NAME) == (2020050110300500, ALBUM_ID)
+    assert album.capture_info(NAME.replace(".jpg", ".MP4")) == (2020050110300500, ALBUM_ID)
+    # Album IDs are returned upper case
+    assert album.capture_info("2020050110300500-" + ALBUM_ID.lower() + ".png")[1] == ALBUM_ID
+
+
+def test_capture_time():
+    (time, _) = album.capture_info(NAME)
+    assert album.time_fields(time) == (2020, 5, 1, 10, 30, 5)
+    assert album.capture_seconds(time) == calendar.timegm((2020, 5, 1, 10, 30, 5))
+
+
+@pytest.mark.parametrize("name", [
+    # Short and long
+    "",
+    NAME[:-1],
+    NAME[:20],
+    "0" + NAME,
+    # Not a capture extension
+    NAME.replace(".jpg", ".txt"),
+    # Separator missing
+    NAME.replace("-", "_"),
+    # Time that is not all digits, or not a time
+    "2020O50110300500-" + ALBUM_ID + ".jpg",
+    u"２020050110300500-" + ALBUM_ID + ".jpg",
+    "2020130110300500-" + ALBUM_ID + ".jpg",
+    "2020050010300500-" + ALBUM_ID + ".jpg",
+    "2020050124300500-" + ALBUM_ID + ".jpg",
+    "2020050110600500-" + ALBUM_ID + ".jpg",
+    "2020050110306000-" + ALBUM_ID + ".jpg",
+    # Album ID that is not 32 hex digits
+    "2020050110300500-" + "G" + ALBUM_ID[1:] + ".jpg",
+    "2020050110300500-0x" + ALBUM_ID[2:] + ".jpg",
+    "2020050110300500-+" + ALBUM_ID[1:] + ".jpg",
+    "2020050110300500- " + ALBUM_ID[1:] + ".jpg",
+    "2020050110300500-" + ALBUM_ID[:10] + "_" + ALBUM_ID[11:] + ".jpg",
+])
+def test_not_a_capture(name):
+    assert album.capture_info(name) is None
+
+
+def test_album_index_orders_captures():
+    index = album.AlbumIndex()
+    other = "0" * 32
+    for (name, item) in [("2020050110300500-%s.jpg" % ALBUM_ID, 1), ("2019010100000000-%s.mp4" % other, 2),
+                         ("2019123123595900-%s.jpg" % ALBUM_ID, 3), ("not a capture.jpg", 4)]:
+        index.add(name, item)
+    assert len(index) == 3
+    assert list(index.titles()) == [(other, [(2019010100000000, 2)]),
+                                    (ALBUM_ID, [(2019123123595900, 3), (2020050110300500, 1)])]
+
+
+def test_screenshots_parser():
+    source = MemorySource(NAME, b"not a jpeg", "/Nintendo/Album/2020/05/01/")
+    assert screenshots.matches(source)
+    assert not screenshots.matches(MemorySource("2020050110300500.jpg", b""))
+    assert list(screenshots.parse(source)) == [(screenshots.ARTIFACT, [
+        ("TSK_ATT_NS_GAME", u"Nintendo Switch"),
+        ("TSK_ATT_NS_TAKEN_DATETIME", calendar.timegm((2020, 5, 1, 10, 30, 5))),
+    ])]
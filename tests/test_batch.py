@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+from switch_forensics import batch
+
+
+def test_bundle_folders_follow_the_dump(tmp_path):
+    dumps = [str(tmp_path / "case1" / "nand"), str(tmp_path / "case2" / "nand"), str(tmp_path / "rawnand.bin")]
+    folders = batch.bundle_folders(dumps, "out")
+    # Dumps with the same name get different folders
+    assert len(set(folders.values())) == 3
+    assert all(os.path.basename(folders[dump]).startswith("nand-") for dump in dumps[:2])
+    # Reordering the manifest or adding to it keeps every dump's folder
+    moved = batch.bundle_folders([str(tmp_path / "new" / "nand")] + dumps[::-1], "out")
+    assert all(moved[dump] == folders[dump] for dump in dumps)
+
+
+def test_bundle_folders_same_path_spelled_differently(tmp_path):
+    dump = str(tmp_path / "case1" / "nand")
+    folders = batch.bundle_folders([dump, dump + os.sep, str(tmp_path / "case1" / "." / "nand")], "out")
+    assert len(set(folders.values())) == 1
+
+
+def test_available_memory_from_meminfo(tmp_path):
+    meminfo = tmp_path / "meminfo"
+    meminfo.write_text(u"MemTotal:       16384000 kB\nMemFree:          102400 kB\nMemAvailable:    8192000 kB\n")
+    assert batch.available_memory(str(meminfo)) == 8192000 * 1024
+
+
+def test_available_memory_without_meminfo(tmp_path):
+    memory = batch.available_memory(str(tmp_path / "missing"))
+    assert memory is None or memory > 0
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+import sqlite3
+
+import pytest
+
+from switch_forensics import export
+
+
+# The parts of the TSK case database schema the export reads
+SCHEMA = """
+CREATE TABLE blackboard_artifact_types (artifact_type_id INTEGER, type_name TEXT, display_name TEXT);
+CREATE TABLE blackboard_attribute_types (attribute_type_id INTEGER, type_name TEXT, display_name TEXT, value_type INTEGER);
+CREATE TABLE blackboard_artifacts (artifact_id INTEGER PRIMARY KEY, obj_id INTEGER, artifact_obj_id INTEGER,
+                                   data_source_obj_id INTEGER, artifact_type_id INTEGER, review_status_id INTEGER);
+CREATE TABLE blackboard_attributes (artifact_id INTEGER, artifact_type_id INTEGER, source TEXT, context TEXT,
+                                    attribute_type_id INTEGER, value_type INTEGER, value_byte BLOB, value_text TEXT,
+                                    value_int32 INTEGER, value_int64 INTEGER, value_double REAL);
+CREATE TABLE tsk_files (obj_id INTEGER, name TEXT, parent_path TEXT);
+CREATE TABLE data_source_info (obj_id INTEGER, device_id TEXT);
+"""
+
+ARTIFACT_TYPES = [(1, "TSK_GEN_INFO"), (50, "TSK_ART_NS_WIFI"), (51, "TSK_ART_NS_MPH")]
+ATTRIBUTE_TYPES = [
+    (100, "TSK_ATT_NS_WIFI_SSID", export.STRING),
+    (101, "TSK_ATT_NS_WIFI_PSK", export.STRING),
+    (102, "TSK_ATT_MPH_DATETIME", export.DATETIME),
+    (103, "TSK_ATT_MPH_USER", export.STRING),
+]
+VALUE_COLUMNS = {export.STRING: "value_text", export.DATETIME: "value_int64", export.INTEGER: "value_int32"}
+
+
+# A case folder named name holding an autopsy.db with the given artifacts, each
+# (artifact type id, [(attribute type id, value type, value), ...])
+def make_case(folder, name, device, artifacts):
+    caseFolder = folder / name
+    caseFolder.mkdir()
+    path = str(caseFolder / export.CASE_DATABASE)
+    connection = sqlite3.connect(path)
+    connection.executescript(SCHEMA)
+    connection.executemany("INSERT INTO blackboard_artifact_types VALUES (?, ?, '')", ARTIFACT_TYPES)
+    connection.executemany("INSERT INTO blackboard_attribute_types VALUES (?, ?, '', ?)", ATTRIBUTE_TYPES)
+    connection.execute("INSERT INTO tsk_files VALUES (7, '8000000000000050', '/save/')")
+    connection.execute("INSERT INTO data_source_info VALUES (1, ?)", (device,))
+    for (artifactId, (artifactTypeId, attributes)) in enumerate(artifacts, 1):
+        connection.execute("INSERT INTO blackboard_artifacts VALUES (?, 7, 0, 1, ?, 0)", (artifactId, artifactTypeId))
+        for (attributeTypeId, valueType, value) in attributes:
+            connection.execute("INSERT INTO blackboard_attributes (artifact_id, artifact_type_id, attribute_type_id, "
+                               "value_type, %s) VALUES (?, ?, ?, ?, ?)" % VALUE_COLUMNS[valueType],
+                               (artifactId, artifactTypeId, attributeTypeId, valueType, value))
+    connection.commit()
+    connection.close()
+    return path
+
+
+@pytest.fixture
+def cases(tmp_path):
+    make_case(tmp_path, "caseA", "device-a", [
+        (50, [(100, export.STRING, u"home"), (101, export.STRING, u"secret")]),
+        (50, [(100, export.STRING, u"café")]),
+        (51, [(102, export.DATETIME, 1600000000), (103, export.STRING, u"Alice")]),
+        # Not a Switch artifact, left out
+        (1, [(100, export.STRING, u"other")]),
+    ])
+    make_case(tmp_path, "caseB", "device-b", [
+        (50, [(100, export.STRING, u"home")]),
+    ])
+    return tmp_path
+
+
+def read_table(path, name):
+    connection = sqlite3.connect(path)
+    try:
+        cursor = connection.execute('SELECT * FROM "%s" ORDER BY "case", artifact_id' % name)
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+    finally:
+        connection.close()
+
+
+def test_sqlite_round_trip(cases, tmp_path):
+    output = str(tmp_path / "artifacts.db")
+    databases = list(export.case_databases([str(cases)]))
+    assert len(databases) == 2
+    # Batches smaller than a case, so rows are written over several batches
+    counts = export.export(databases, export.SqliteWriter(output), batchSize=1)
+    assert counts == {"TSK_ART_NS_WIFI": 3, "TSK_ART_NS_MPH": 1}
+
+    wifi = read_table(output, "TSK_ART_NS_WIFI")
+    assert [(row["case"], row["device"], row["TSK_ATT_NS_WIFI_SSID"], row["TSK_ATT_NS_WIFI_PSK"]) for row in wifi] == [
+        ("caseA", "device-a", u"home", u"secret"),
+        ("caseA", "device-a", u"café", None),
+        ("caseB", "device-b", u"home", None),
+    ]
+    assert wifi[0]["file"] == "/save/8000000000000050"
+    (played,) = read_table(output, "TSK_ART_NS_MPH")
+    assert played["TSK_ATT_MPH_DATETIME"] == 1600000000
+    assert played["TSK_ATT_MPH_USER"] == u"Alice"
+
+
+def test_mixed_value_types_become_text(tmp_path):
+    make_case(tmp_path, "caseA", "device-a", [(51, [(103, export.STRING, u"Alice")])])
+    make_case(tmp_path, "caseB", "device-b", [(51, [(103, export.INTEGER, 42)])])
+    output = str(tmp_path / "artifacts.db")
+    export.export(export.case_databases([str(tmp_path)]), export.SqliteWriter(output))
+    assert [row["TSK_ATT_MPH_USER"] for row in read_table(output, "TSK_ART_NS_MPH")] == [u"Alice", u"42"]
+
+
+def test_unreadable_case_is_reported(cases, tmp_path):
+    broken = tmp_path / "broken.db"
+    broken.write_bytes(b"not a database" * 100)
+    failed = []
+    output = str(tmp_path / "artifacts.db")
+    counts = export.export([str(broken)] + list(export.case_databases([str(cases)])), export.SqliteWriter(output),
+                           error=lambda path, e: failed.append(path))
+    assert failed == [str(broken)]
+    assert counts["TSK_ART_NS_WIFI"] == 3
+
+
+def test_parquet_round_trip(cases, tmp_path):
+    pyarrow = pytest.importorskip("pyarrow")
+    import pyarrow.parquet
+    output = tmp_path / "parquet"
+    export.export(export.case_databases([str(cases)]), export.ArrowWriter(str(output)))
+    table = pyarrow.parquet.read_table(str(output / "TSK_ART_NS_MPH.parquet"))
+    # Parquet has no seconds unit, the times are read back in milliseconds
+    played = table.column("TSK_ATT_MPH_DATETIME").cast(pyarrow.timestamp("s", tz="UTC")).cast(pyarrow.int64())
+    assert played.to_pylist() == [1600000000]
+    assert table.column("TSK_ATT_MPH_USER").to_pylist() == [u"Alice"]
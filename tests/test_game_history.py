@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+import struct
+import calendar
+from collections import OrderedDict
+
+from conftest import MemorySource
+from switch_forensics import game_history
+from switch_forensics._vendor.msgpack import packb
+
+
+MARIO = "0100000000010000"
+
+
+# A play event as the console logs it: a map starting with sys_info
+def event(appId, name, recordedAt, nsaId=u"0123456789abcdef", extra=None):
+    fields = OrderedDict()
+    fields[u"sys_info"] = {u"os_version": u"10.0.0"}
+    fields[u"app_id"] = appId
+    fields[u"event"] = name
+    fields[u"nc_recorded_at"] = recordedAt
+    fields[u"nsa_id"] = nsaId
+    if extra is not None:
+        fields[u"padding"] = extra
+    return packb(fields, use_bin_type=True)
+
+
+def log(*events):
+    # The log starts with a header that is not an event
+    return b"\x00\x01\x02header" + b"".join(events)
+
+
+def mario(name=u"Launch", recordedAt=u"2020-05-01T10:00:00Z"):
+    return event(struct.pack(">Q", int(MARIO, 16)), name, recordedAt)
+
+
+def test_records_are_cut_at_each_marker():
+    data = log(mario(), mario(u"Exit"))
+    records = list(game_history.records(MemorySource("80000000000000A2", data)))
+    assert len(records) == 2
+    assert all(record.startswith(game_history.EVENT_MARKER) for record in records)
+    assert b"".join(records) == data[data.find(game_history.EVENT_MARKER):]
+
+
+def test_records_split_across_reads():
+    data = log(*[mario(u"Event %d" % index) for index in range(20)])
+    whole = list(game_history.records(MemorySource("80000000000000A2", data)))
+    for readSize in (1, 5, 9, 64):
+        assert list(game_history.records(MemorySource("80000000000000A2", data), readSize)) == whole
+
+
+def test_marker_split_across_reads():
+    data = log(mario())
+    start = data.find(game_history.EVENT_MARKER)
+    # The first read ends inside the marker
+    records = list(game_history.records(MemorySource("80000000000000A2", data), start + 3))
+    assert len(records) == 1 and records[0] == data[start:]
+
+
+def test_long_event_is_cut():
+    data = log(event(MARIO, u"Launch", u"2020-05-01T10:00:00Z", extra=b"x" * (game_history.MAX_EVENT_SIZE * 2)),
+               mario(u"Exit"))
+    records = list(game_history.records(MemorySource("80000000000000A2", data), 4096))
+    assert len(records[0]) == game_history.MAX_EVENT_SIZE
+    assert game_history.decode_event(records[-1])["event"] == u"Exit"
+
+
+def test_decode_event_fields():
+    source = MemorySource("80000000000000A2", log(mario(), event(0x0100000000010000, u"Exit", u"2020-05-01 11:00:00")))
+    events = list(game_history.events(source))
+    assert events == [
+        {"app_id": MARIO, "event": u"Launch", "nc_recorded_at": u"2020-05-01T10:00:00Z", "nsa_id": u"0123456789abcdef"},
+        {"app_id": MARIO, "event": u"Exit", "nc_recorded_at": u"2020-05-01 11:00:00", "nsa_id": u"0123456789abcdef"},
+    ]
+
+
+def test_fields_in_nested_maps():
+    fields = OrderedDict([(u"sys_info", {u"app_id": struct.pack(">Q", 1)}), (u"event", {u"event": u"Nested"})])
+    decoded = game_history.decode_event(packb(fields, use_bin_type=True)[1:])
+    assert decoded["app_id"] == "%016X" % 1
+    assert decoded["event"] == u"Nested"
+
+
+def test_event_without_app_id_skipped():
+    source = MemorySource("80000000000000A2", log(event(None, u"Launch", u"2020-05-01T10:00:00Z"), mario()))
+    assert [e["event"] for e in game_history.events(source)] == [u"Launch"]
+    assert len(list(game_history.records(source))) == 2
+
+
+def test_truncated_last_event():
+    data = log(mario(), mario(u"Exit"))
+    # Cut inside the last event's nc_recorded_at
+    cut = data[:data.rfind(b"2020")]
+    events = list(game_history.events(MemorySource("80000000000000A2", cut)))
+    assert [e["event"] for e in events] == [u"Launch", u"Exit"]
+    assert events[1]["nc_recorded_at"] is None
+
+
+def test_parse():
+    artifacts = list(game_history.parse(MemorySource("80000000000000A2", log(mario()), "/save/")))
+    assert artifacts == [(game_history.ARTIFACT, [
+        ("TSK_ATT_NS_RGH_GAME", u"Super Mario Odyssey™"),
+        ("TSK_ATT_NS_RGS_E", u"Launch"),
+        ("TSK_ATT_NS_RGS_DATETIME", calendar.timegm((2020, 5, 1, 10, 0, 0))),
+    ])]
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+import struct
+import calendar
+
+from conftest import MemorySource
+from switch_forensics import media
+from switch_forensics import screenshots
+
+
+def segment(marker, body):
+    return struct.pack(">BBH", 0xFF, marker, len(body) + 2) + body
+
+
+# A baseline JPEG header: SOI, an optional APP1 segment and SOF0, then the scan
+def jpeg(width, height, app1=None):
+    data = b"\xff\xd8"
+    if app1 is not None:
+        data += segment(0xE1, app1)
+    data += segment(0xC0, struct.pack(">BHHB", 8, height, width, 3) + b"\x00" * 9)
+    return data + segment(0xDA, b"\x00" * 10) + b"\x12\x34" * 64
+
+
+def ifd_entry(tag, fieldType, count, value):
+    return struct.pack("<HHI", tag, fieldType, count) + value
+
+
+# Little endian Exif: Make, Model and a pointer to an Exif IFD holding
+# DateTimeOriginal and the pixel dimensions
+def exif():
+    make = b"Nintendo co., ltd\x00"
+    model = b"Nintendo Switch\x00"
+    created = b"2020:01:02 03:04:05\x00"
+    ifd0 = 8
+    exifIfd = ifd0 + 2 + 3 * 12 + 4
+    values = exifIfd + 2 + 3 * 12 + 4
+    tiff = b"II*\x00" + struct.pack("<I", ifd0)
+    tiff += struct.pack("<H", 3)
+    tiff += ifd_entry(media.EXIF_MAKE, 2, len(make), struct.pack("<I", values))
+    tiff += ifd_entry(media.EXIF_MODEL, 2, len(model), struct.pack("<I", values + len(make)))
+    tiff += ifd_entry(media.EXIF_IFD, 4, 1, struct.pack("<I", exifIfd))
+    tiff += struct.pack("<I", 0)
+    tiff += struct.pack("<H", 3)
+    tiff += ifd_entry(media.EXIF_DATETIME_ORIGINAL, 2, len(created), struct.pack("<I", values + len(make) + len(model)))
+    tiff += ifd_entry(media.EXIF_WIDTH, 4, 1, struct.pack("<I", 1280))
+    tiff += ifd_entry(media.EXIF_HEIGHT, 3, 1, struct.pack("<HH", 720, 0))
+    tiff += struct.pack("<I", 0)
+    return b"Exif\x00\x00" + tiff + make + model + created
+
+
+def atom(atomType, body):
+    return struct.pack(">I4s", len(body) + 8, atomType) + body
+
+
+# An MP4 with ftyp, a large mdat and moov after it, as the console writes clips
+def mp4(created, timescale=1000, duration=30000, width=1280, height=720):
+    mvhd = atom(b"mvhd", b"\x00\x00\x00\x00" + struct.pack(">IIII", created, created, timescale, duration) + b"\x00" * 80)
+    tkhd = atom(b"tkhd", b"\x00" * 76 + struct.pack(">II", width << 16, height << 16))
+    return (atom(b"ftyp", b"isom\x00\x00\x02\x00") + atom(b"mdat", b"\x00" * 4096) +
+            atom(b"moov", mvhd + atom(b"trak", tkhd)))
+
+
+def test_jpeg_sof_dimensions():
+    metadata = media.capture_metadata(MemorySource("capture.jpg", jpeg(1280, 720)))
+    assert metadata == {"width": 1280, "height": 720}
+
+
+def test_jpeg_exif():
+    metadata = media.capture_metadata(MemorySource("capture.jpg", jpeg(640, 360, exif())))
+    assert metadata["make"] == "Nintendo co., ltd"
+    assert metadata["model"] == "Nintendo Switch"
+    # Exif dimensions are taken over those of the SOF segment
+    assert (metadata["width"], metadata["height"]) == (1280, 720)
+    assert metadata["created"] == calendar.timegm((2020, 1, 2, 3, 4, 5))
+    assert "created_utc" not in metadata
+
+
+def test_mp4_headers():
+    created = calendar.timegm((2020, 1, 2, 3, 4, 5))
+    metadata = media.capture_metadata(MemorySource("clip.mp4", mp4(created + media.MP4_EPOCH_OFFSET)))
+    assert metadata == {"width": 1280, "height": 720, "duration": 30.0, "created_utc": created}
+
+
+def test_mp4_unset_creation_time():
+    metadata = media.capture_metadata(MemorySource("clip.mp4", mp4(0)))
+    assert "created_utc" not in metadata and metadata["duration"] == 30.0
+
+
+def test_cut_short_or_wrong_type():
+    assert media.capture_metadata(MemorySource("capture.jpg", jpeg(1280, 720)[:8])) == {}
+    assert media.capture_metadata(MemorySource("clip.mp4", b"\x00\x00")) == {}
+    assert media.capture_metadata(MemorySource("capture.jpg", b"not a jpeg")) == {}
+
+
+def test_capture_attributes_keep_clocks_apart():
+    created = calendar.timegm((2020, 1, 2, 3, 4, 5))
+    attributes = dict(screenshots.capture_attributes("Game", 2020010203040500, {"created_utc": created}))
+    assert attributes["TSK_ATT_NS_CAPTURE_CREATED_UTC_DATETIME"] == created
+    assert "TSK_ATT_NS_CAPTURE_CREATED_DATETIME" not in attributes
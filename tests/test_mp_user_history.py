@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+import struct
+import calendar
+
+import pytest
+
+from switch_forensics import mp_user_history
+
+
+RECORD_SIZE = 0x100
+PLAYED = calendar.timegm((2020, 5, 1, 10, 0, 0))
+
+
+# A history.bin record written field by field at the offsets the console uses
+def record(username, titleId=0x0100000000010000, timestamp=PLAYED):
+    data = bytearray(b"\xcc" * RECORD_SIZE)
+    data[0x00:0x10] = bytes(bytearray(range(0x10)))
+    struct.pack_into("<Q", data, 0x10, 0x1122334455667788)
+    struct.pack_into("<Q", data, 0x18, titleId)
+    struct.pack_into("<Q", data, 0x20, timestamp)
+    name = username.encode("utf-8")
+    data[0x28:0x60] = name + b"\x00" * (0x38 - len(name))
+    data[0x60:0x70] = bytes(bytearray(range(0xA0, 0xB0)))
+    return bytes(data)
+
+
+def test_record_layout():
+    assert mp_user_history.RECORD.size == RECORD_SIZE
+    (decoded,) = mp_user_history.records(record(u"Alice"))
+    assert decoded == {
+        "local_user_id": "000102030405060708090A0B0C0D0E0F",
+        "local_account_id": "1122334455667788",
+        "title_id": "0100000000010000",
+        "timestamp": PLAYED,
+        "username": u"Alice",
+        "user_id": "A0A1A2A3A4A5A6A7A8A9AAABACADAEAF",
+    }
+
+
+def test_username_fills_its_field():
+    name = u"ÄÖÜ" + u"x" * (0x38 - 6)
+    (decoded,) = mp_user_history.records(record(name))
+    assert decoded["username"] == name
+
+
+def test_time_not_set():
+    assert [r["timestamp"] for r in mp_user_history.records(record(u"A", timestamp=0) +
+                                                             record(u"B", timestamp=2 ** 63))] == [None, None]
+
+
+def test_truncated_last_record_ignored():
+    data = record(u"Alice") + record(u"Bob") + record(u"Carol")[:RECORD_SIZE - 1]
+    assert [r["username"] for r in mp_user_history.records(data)] == [u"Alice", u"Bob"]
+    assert list(mp_user_history.records(b"")) == []
+
+
+def test_columns():
+    data = record(u"Alice") + record(u"Bob", timestamp=PLAYED + 60) + b"\x00" * 10
+    table = mp_user_history.columns(data)
+    assert [int(value) for value in table["timestamp"]] == [PLAYED, PLAYED + 60]
+    assert [int(value) for value in table["title_id"]] == [0x0100000000010000] * 2
+    assert [bytes(value).split(b"\x00")[0] for value in table["username"]] == [b"Alice", b"Bob"]
+
+
+def test_columns_without_numpy(monkeypatch):
+    monkeypatch.setattr(mp_user_history, "numpy", None)
+    table = mp_user_history.columns(record(u"Alice"))
+    assert table["timestamp"] == [PLAYED]
+    assert table["local_account_id"] == [0x1122334455667788]
+
+
+def test_columns_with_numpy():
+    pytest.importorskip("numpy")
+    table = mp_user_history.columns(record(u"Alice"))
+    assert table["timestamp"].dtype.str == "<u8"
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+# The in-place reading added to the vendored msgpack fallback: reset(),
+# view_raw, map_keys and unpack_buffers
+
+import pytest
+
+from switch_forensics._vendor.msgpack import ExtraData
+from switch_forensics._vendor.msgpack import ExtType
+from switch_forensics._vendor.msgpack import packb
+from switch_forensics._vendor.msgpack.fallback import Unpacker
+from switch_forensics._vendor.msgpack.fallback import unpack_buffers
+from switch_forensics._vendor.msgpack.fallback import unpackb
+
+
+def pack(value):
+    return packb(value, use_bin_type=True)
+
+
+def test_reset_reads_each_buffer_from_its_start():
+    unpacker = Unpacker(None, raw=False)
+    unpacker.reset(pack({u"a": 1}) + pack([2, 3]))
+    assert unpacker.unpack() == {u"a": 1}
+    unpacker.reset(memoryview(pack(u"second")))
+    assert unpacker.unpack() == u"second"
+    assert unpacker.tell() == len(pack(u"second"))
+    with pytest.raises(Exception):
+        unpacker.unpack()
+
+
+def test_reset_then_feed_completes_a_split_object():
+    packed = pack([b"x" * 100, {u"key": u"value"}])
+    unpacker = Unpacker(None, raw=False)
+    unpacker.reset(bytearray(packed[:50]))
+    unpacker.feed(packed[50:])
+    assert unpacker.unpack() == [b"x" * 100, {u"key": u"value"}]
+
+
+def test_view_raw_values_are_views_of_the_buffer():
+    buffer = bytearray(pack({b"key": b"value"}))
+    result = unpackb(buffer, raw=True, view_raw=True)
+    (key,) = result
+    assert type(key) is bytes
+    assert isinstance(result[key], memoryview)
+    # A view sees the buffer change, a key does not
+    buffer[:] = bytearray(len(buffer))
+    assert key == b"key"
+    assert bytes(result[b"key"]) == b"\x00" * 5
+
+
+def test_view_raw_copies_keys_everywhere():
+    buffer = bytearray(pack({b"outer": {b"inner": b"value"}, b"list": [{b"in list": 1}]}))
+    result = unpackb(buffer, raw=True, view_raw=True)
+    pairs = unpackb(buffer, raw=True, view_raw=True, object_pairs_hook=list)
+    kept = unpackb(buffer, raw=True, view_raw=True, map_keys={b"outer"})
+    buffer[:] = bytearray(len(buffer))
+    assert sorted(result) == [b"list", b"outer"]
+    assert list(result[b"outer"]) == [b"inner"]
+    assert list(result[b"list"][0]) == [b"in list"]
+    assert sorted(key for (key, _) in pairs) == [b"list", b"outer"]
+    assert list(kept) == [b"outer"] and list(kept[b"outer"]) == [b"inner"]
+
+
+def test_extra_data_and_ext_data_are_copied():
+    buffer = bytearray(pack(ExtType(5, b"ext data")) + b"\x01\x02")
+    with pytest.raises(ExtraData) as error:
+        unpackb(buffer, view_raw=True)
+    ext = error.value.unpacked
+    buffer[:] = bytearray(len(buffer))
+    assert type(error.value.extra) is bytes and error.value.extra == b"\x01\x02"
+    assert ext == ExtType(5, b"ext data")
+
+
+def test_view_raw_has_no_effect_on_fed_data():
+    unpacker = Unpacker(None, raw=True, view_raw=True)
+    unpacker.feed(pack(b"fed"))
+    assert type(unpacker.unpack()) is bytes
+
+
+def test_map_keys():
+    packed = pack({u"keep": {u"nested": 1, u"also": 2}, u"skip": [1, 2, {u"x": 3}], u"other": u"value"})
+    assert unpackb(packed, raw=False, map_keys={u"keep", u"other"}) == {
+        u"keep": {u"nested": 1, u"also": 2}, u"other": u"value"}
+    assert unpackb(packed, raw=False, map_keys=lambda key: key.startswith(u"s")) == {u"skip": [1, 2, {u"x": 3}]}
+    # Unhashable keys are never kept
+    assert unpackb(pack({(1, 2): 1, u"a": 2}), raw=False, use_list=False, map_keys={u"a"}) == {u"a": 2}
+
+
+def test_unpack_buffers_over_chunks_of_one_buffer():
+    values = [{u"n": index, u"data": b"d" * index} for index in range(20)]
+    buffer = bytearray()
+    bounds = []
+    for value in values:
+        start = len(buffer)
+        buffer += pack(value)
+        bounds.append((start, len(buffer)))
+    view = memoryview(buffer)
+    chunks = [view[start:end] for (start, end) in bounds]
+    assert list(unpack_buffers(chunks, raw=False)) == values
+
+
+def test_unpack_buffers_rejects_a_split_object():
+    packed = pack([1, 2, 3, u"text"])
+    with pytest.raises(ValueError):
+        list(unpack_buffers([packed[:3], packed[3:]], raw=False))
+    with pytest.raises(ExtraData) as error:
+        list(unpack_buffers([packed + b"\xc0"], raw=False))
+    assert error.value.extra == b"\xc0"
+
+
+def test_decoding_from_views():
+    text = u"café"
+    for buffer in (pack(text), bytearray(pack(text)), memoryview(pack(text))):
+        assert unpackb(buffer, raw=False) == text
+        assert unpackb(buffer, raw=False, view_raw=True) == text
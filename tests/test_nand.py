@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+import zlib
+import struct
+
+import pytest
+
+from switch_forensics import nand
+
+
+SECTORS = 64
+ENTRY_COUNT = 4
+# Name, first and last LBA
+PARTITIONS = [(u"SYSTEM", 8, 23), (u"USER", 24, 55)]
+
+
+def crc(data):
+    return zlib.crc32(data) & 0xFFFFFFFF
+
+
+def guid(number):
+    return struct.pack("<IHH", number, 0x1234, 0x5678) + bytes(bytearray(range(8)))
+
+
+def gpt_header(currentLba, backupLba, entriesLba, entriesCrc):
+    fields = [nand.GPT_SIGNATURE, 0x10000, nand.GPT_HEADER.size, 0, currentLba, backupLba,
+              8, SECTORS - 9, guid(0), entriesLba, ENTRY_COUNT, nand.GPT_ENTRY.size, entriesCrc]
+    header = nand.GPT_HEADER.pack(*fields)
+    fields[3] = crc(header)
+    return nand.GPT_HEADER.pack(*fields).ljust(nand.SECTOR_SIZE, b"\x00")
+
+
+# An image whose every sector is filled with its own number, with a primary
+# GPT at LBA 1 and a backup at the last LBA
+def image():
+    data = bytearray(b"".join(struct.pack("<I", lba) * (nand.SECTOR_SIZE // 4) for lba in range(SECTORS)))
+    entries = b"".join(nand.GPT_ENTRY.pack(guid(1), guid(index + 2), first, last, 0, name.encode("utf-16-le"))
+                       for (index, (name, first, last)) in enumerate(PARTITIONS))
+    entries = entries.ljust(ENTRY_COUNT * nand.GPT_ENTRY.size, b"\x00")
+    lastLba = SECTORS - 1
+    data[512:1024] = gpt_header(1, lastLba, 2, crc(entries))
+    data[1024:1024 + len(entries)] = entries
+    data[lastLba * 512:] = gpt_header(lastLba, 1, lastLba - 1, crc(entries))
+    data[(lastLba - 1) * 512:(lastLba - 1) * 512 + len(entries)] = entries
+    return data
+
+
+def write(path, data):
+    with open(str(path), "wb") as out:
+        out.write(bytes(data))
+    return str(path)
+
+
+def sector(lba):
+    return struct.pack("<I", lba) * (nand.SECTOR_SIZE // 4)
+
+
+@pytest.fixture(params=["mmap", "file"])
+def opener(request, monkeypatch):
+    if request.param == "file":
+        # Reading the parts as plain files, as on Jython
+        monkeypatch.setattr(nand, "mmap", None)
+    return request.param
+
+
+def test_partitions(tmp_path, opener):
+    with nand.RawNand(write(tmp_path / "rawnand.bin", image())) as raw:
+        assert raw.size == SECTORS * nand.SECTOR_SIZE
+        assert [(p.name, p.offset, p.size) for p in raw.partitions] == [
+            (u"SYSTEM", 8 * 512, 16 * 512), (u"USER", 24 * 512, 32 * 512)]
+        user = raw.partition(u"USER")
+        assert user.guid == nand.format_guid(guid(3))
+        assert user.read(0, 4) == struct.pack("<I", 24)
+        assert bytes(user.view(512, 512)) == sector(25)
+        # Reads stop at the end of the partition
+        assert user.read(user.size - 4, 100) == struct.pack("<I", 55)
+        with pytest.raises(nand.NandError):
+            raw.partition(u"PRODINFO")
+
+
+def test_split_image(tmp_path, opener):
+    data = bytes(image())
+    # Part boundaries fall inside sectors and partitions
+    cuts = [0, 5000, 12300, 20000, len(data)]
+    for index in range(len(cuts) - 1):
+        write(tmp_path / ("rawnand.bin.%02d" % index), data[cuts[index]:cuts[index + 1]])
+    for path in (tmp_path / "rawnand.bin", tmp_path / "rawnand.bin.00"):
+        with nand.RawNand(str(path)) as raw:
+            assert len(raw.storage.parts) == 4
+            assert raw.storage.read(0, len(data)) == data
+            system = raw.partition(u"SYSTEM")
+            assert system.read(4900 - system.offset, 300) == data[4900:5200]
+            assert bytes(system.view(4900 - system.offset, 300)) == data[4900:5200]
+
+
+def test_backup_header_when_primary_damaged(tmp_path):
+    data = image()
+    # One byte of the header changed, its checksum no longer matches
+    data[512 + 0x30] ^= 0xFF
+    with nand.RawNand(write(tmp_path / "rawnand.bin", data)) as raw:
+        assert [p.name for p in raw.partitions] == [u"SYSTEM", u"USER"]
+
+
+def test_backup_header_when_primary_entries_damaged(tmp_path):
+    data = image()
+    data[1024 + 0x38] ^= 0xFF
+    with nand.RawNand(write(tmp_path / "rawnand.bin", data)) as raw:
+        assert [p.name for p in raw.partitions] == [u"SYSTEM", u"USER"]
+
+
+def test_no_valid_gpt(tmp_path):
+    data = image()
+    data[512 + 0x30] ^= 0xFF
+    data[(SECTORS - 1) * 512 + 0x30] ^= 0xFF
+    with pytest.raises(nand.NandError) as error:
+        nand.RawNand(write(tmp_path / "rawnand.bin", data))
+    assert "checksum" in str(error.value)
+
+
+def test_missing_image(tmp_path):
+    with pytest.raises(nand.NandError):
+        nand.RawNand(str(tmp_path / "rawnand.bin"))
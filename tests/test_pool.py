@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+import time
+import threading
+
+import pytest
+
+from switch_forensics import pool
+from switch_forensics import crash_dumps
+from switch_forensics._vendor.msgpack import packb
+
+
+# Longest any test may take before it counts as hung
+TIMEOUT = 10
+
+
+class Stop(BaseException):
+    pass
+
+
+# Runs consume() on another thread, returns what it returned or raised
+def finish(consume):
+    outcome = {}
+
+    def run():
+        try:
+            outcome["value"] = consume()
+        except BaseException as e:
+            outcome["error"] = e
+    thread = threading.Thread(target=run)
+    thread.daemon = True
+    thread.start()
+    thread.join(TIMEOUT)
+    assert not thread.is_alive(), "the pool hung"
+    return outcome
+
+
+# Worker threads left running once a pool is done with, waited for a while
+def leftover_threads(before):
+    deadline = time.time() + TIMEOUT
+    while True:
+        extra = [thread for thread in threading.enumerate() if thread not in before and thread.daemon]
+        if not extra or time.time() > deadline:
+            return extra
+        time.sleep(0.01)
+
+
+def slow_square(value):
+    # Later items finish first, results still come back in order
+    time.sleep(0.001 * (20 - value % 20))
+    return value * value
+
+
+def test_results_in_order():
+    assert list(pool.imap(slow_square, range(100), workers=4)) == [value * value for value in range(100)]
+    assert list(pool.imap(slow_square, range(10), workers=1)) == [value * value for value in range(10)]
+
+
+@pytest.mark.parametrize("error", [ValueError("bad record"), Stop()])
+def test_worker_exception_reaches_caller(error):
+    before = set(threading.enumerate())
+    seen = []
+
+    def decode(value):
+        if value == 37:
+            raise error
+        return value
+
+    def consume():
+        for value in pool.imap(decode, range(1000), workers=4):
+            seen.append(value)
+    outcome = finish(consume)
+    assert outcome.get("error") is error
+    # Everything before the failed item was delivered, nothing after it
+    assert seen == list(range(37))
+    assert leftover_threads(before) == []
+
+
+def test_every_worker_failing():
+    def decode(value):
+        raise KeyError(value)
+    outcome = finish(lambda: list(pool.imap(decode, range(50), workers=3)))
+    assert isinstance(outcome.get("error"), KeyError)
+
+
+def test_caller_stopping_early_releases_workers():
+    before = set(threading.enumerate())
+    results = pool.imap(slow_square, range(1000), workers=4)
+    assert next(results) == 0
+    results.close()
+    assert leftover_threads(before) == []
+
+
+def test_crash_report_decode_error_reaches_caller():
+    good = packb({u"ErrorCode": u"2162-0002", u"ReportIdentifier": u"abc"}, use_bin_type=True)
+    assert sorted(next(pool.imap(crash_dumps.decode_report, [good], workers=2))) == [
+        ("TSK_ATT_CD_ERRC", u"2162-0002"), ("TSK_ATT_CD_RID", u"abc")]
+    reports = [good, good, b"\xc1", good]
+    outcome = finish(lambda: list(pool.imap(crash_dumps.decode_report, reports, workers=2)))
+    assert isinstance(outcome.get("error"), Exception)
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+from switch_forensics import game_history
+from switch_forensics import mp_user_history
+from switch_forensics.reingest import artifact_digest
+from switch_forensics.reingest import same_file
+from switch_forensics.reingest import select_artifacts
+
+
+FILE_STATE = {"size": 100, "mtime": 1, "crtime": 1, "digest": "abc", "version": 2}
+
+
+def played(game, time):
+    return (game_history.ARTIFACT, [("TSK_ATT_NS_RGH_GAME", game), ("TSK_ATT_NS_RGS_E", "Launch"),
+                                    ("TSK_ATT_NS_RGS_DATETIME", time)])
+
+
+def multiplayer(game, user, time):
+    return (mp_user_history.ARTIFACT, [("TSK_ATT_MPH_USER", user), ("TSK_ATT_MPH_GAME", game),
+                                       ("TSK_ATT_MPH_DATETIME", time)])
+
+
+# The state a run leaves for a file that gave artifacts
+def state(artifacts, catalog="1"):
+    entry = dict(FILE_STATE, catalog=catalog)
+    entry["artifacts"] = [artifact_digest(name, attributes) for (name, attributes) in artifacts]
+    return entry
+
+
+# A blackboard holding artifacts with the given key values
+def blackboard(key, artifacts):
+    keys = set((name, tuple(dict(attributes).get(field) for field in key)) for (name, attributes) in artifacts)
+    return lambda name, values: (name, values) in keys
+
+
+def never(name, values):
+    raise AssertionError("the blackboard was searched")
+
+
+def test_same_file():
+    assert same_file(state([]), FILE_STATE)
+    assert not same_file(state([]), dict(FILE_STATE, version=3))
+    assert not same_file(None, FILE_STATE)
+
+
+def test_first_run_posts_everything_new():
+    artifacts = [multiplayer("Game A", "Alice", 10), multiplayer("Game A", "Bob", 20)]
+    posted = blackboard(mp_user_history.KEY, artifacts[:1])
+    (selected, digests, stale) = select_artifacts(artifacts, None, False, mp_user_history.KEY, posted)
+    assert selected == artifacts[1:]
+    assert len(digests) == 2 and stale == []
+
+
+def test_catalog_change_without_key_posts_renamed():
+    before = [played("Unknown gameID", 10), played("Game B", 20)]
+    after = [played("Game A", 10), played("Game B", 20)]
+    (selected, digests, stale) = select_artifacts(after, state(before), True, game_history.KEY, never)
+    assert selected == after[:1]
+    assert digests == state(after)["artifacts"]
+    assert stale == [artifact_digest(*before[0])]
+
+
+def test_catalog_change_with_key_posts_renamed():
+    before = [multiplayer("Unknown gameID", "Alice", 10), multiplayer("Game B", "Bob", 20)]
+    after = [multiplayer("Game A", "Alice", 10), multiplayer("Game B", "Bob", 20)]
+    # The key, user and time, is the same for the renamed artifact and the one it replaces
+    (selected, _, stale) = select_artifacts(after, state(before), True, mp_user_history.KEY, never)
+    assert selected == after[:1]
+    assert stale == [artifact_digest(*before[0])]
+
+
+def test_catalog_change_that_renames_nothing():
+    artifacts = [played("Game A", 10)]
+    (selected, digests, stale) = select_artifacts(artifacts, state(artifacts), True, game_history.KEY, never)
+    assert selected == [] and stale == []
+    assert digests == state(artifacts)["artifacts"]
+
+
+def test_changed_file_without_key_skips_posted():
+    before = [played("Game A", 10)]
+    after = [played("Game A", 10), played("Game A", 30)]
+    (selected, _, stale) = select_artifacts(after, state(before), False, game_history.KEY, never)
+    assert selected == after[1:]
+    assert stale == []
+
+
+def test_changed_file_with_key_uses_blackboard():
+    before = [multiplayer("Game A", "Alice", 10)]
+    after = [multiplayer("Game A", "Alice", 10), multiplayer("Game A", "Bob", 30)]
+    posted = blackboard(mp_user_history.KEY, before)
+    (selected, _, _) = select_artifacts(after, state(before), False, mp_user_history.KEY, posted)
+    assert selected == after[1:]
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+
+import io
+import struct
+
+import pytest
+
+from switch_forensics import savefs
+
+
+BLOCK_SIZE = 0x200
+BLOCKS = 8
+# Size of the meta remap data: the journal map table and the allocation table
+META_SIZE = 0x1000
+DUPLEX_BLOCK_SIZE = 0x400
+# In the second duplex block, which is read from copy B
+FAT_OFFSET = DUPLEX_BLOCK_SIZE
+
+CONTENT = bytes(bytearray(range(256))) * 7
+
+
+def fs_entry(parent, name, value, following):
+    entry = bytearray(savefs.FS_ENTRY_SIZE)
+    struct.pack_into("<I", entry, 0, parent)
+    entry[4:4 + len(name)] = name
+    entry[0x48:0x48 + len(value)] = value
+    struct.pack_into("<I", entry, 0x5C, following)
+    return entry
+
+
+# The file system data: directory table in block 0, file table in block 1,
+# /history.bin in blocks 2-4 and 6, and an empty /sub/a.txt
+def file_system():
+    directories = bytearray(BLOCK_SIZE)
+    directories[0x60:0xC0] = fs_entry(0, b"", b"", 2)
+    directories[0xC0:0x120] = fs_entry(0, b"", b"", 3)
+    directories[0x120:0x180] = fs_entry(2, b"sub", b"", 0)
+    files = bytearray(BLOCK_SIZE)
+    files[0x60:0xC0] = fs_entry(0, b"", b"", 2)
+    files[0xC0:0x120] = fs_entry(2, b"history.bin", struct.pack("<IQ", 2, len(CONTENT)), 3)
+    files[0x120:0x180] = fs_entry(3, b"a.txt", struct.pack("<IQ", savefs.EMPTY_BLOCK, 0), 0)
+
+    data = bytearray(BLOCKS * BLOCK_SIZE)
+    data[0:BLOCK_SIZE] = directories
+    data[BLOCK_SIZE:2 * BLOCK_SIZE] = files
+    data[2 * BLOCK_SIZE:5 * BLOCK_SIZE] = CONTENT[:3 * BLOCK_SIZE]
+    data[6 * BLOCK_SIZE:6 * BLOCK_SIZE + len(CONTENT) - 3 * BLOCK_SIZE] = CONTENT[3 * BLOCK_SIZE:]
+    return data
+
+
+# Chains: block 0 and block 1 alone, and 2-4 followed by 6
+def allocation_table():
+    table = bytearray(16 * 8)
+
+    def entry(index, previous, following):
+        struct.pack_into("<II", table, index * 8, previous, following)
+    entry(1, 0x80000000, 0)
+    entry(2, 0x80000000, 0)
+    entry(3, 0x80000000, 0x80000000 | 7)
+    entry(4, 0x80000000 | 3, 5)
+    entry(7, 3, 0)
+    return table
+
+
+# A save image with every layer: the journal stores virtual block v at physical
+# block BLOCKS-1-v, the duplex data has its second block current in copy B and
+# the main remap swaps the two halves of the remapped data
+def save_image(patch=None):
+    data = file_system()
+    journal = bytearray(BLOCKS * BLOCK_SIZE)
+    for block in range(BLOCKS):
+        physical = BLOCKS - 1 - block
+        journal[physical * BLOCK_SIZE:(physical + 1) * BLOCK_SIZE] = data[block * BLOCK_SIZE:(block + 1) * BLOCK_SIZE]
+    journalMap = b"".join(struct.pack("<II", 0x80000000 | (BLOCKS - 1 - block), block) for block in range(BLOCKS))
+
+    meta = bytearray(META_SIZE)
+    meta[0:len(journalMap)] = journalMap
+    fat = allocation_table()
+    meta[FAT_OFFSET:FAT_OFFSET + len(fat)] = fat
+
+    (level1A, level1B, level1Size) = (0, 0x100, 0x100)
+    (duplexA, duplexB) = (0x1000, 0x1000 + META_SIZE)
+    journalOffset = 0x3000
+    remapped = bytearray(journalOffset + len(journal))
+    remapped[duplexA:duplexA + META_SIZE] = meta
+    # Stale data in copy A of the second duplex block, copy B is current
+    remapped[duplexA + DUPLEX_BLOCK_SIZE:duplexA + 2 * DUPLEX_BLOCK_SIZE] = b"\xee" * DUPLEX_BLOCK_SIZE
+    remapped[duplexB + DUPLEX_BLOCK_SIZE:duplexB + 2 * DUPLEX_BLOCK_SIZE] = meta[DUPLEX_BLOCK_SIZE:2 * DUPLEX_BLOCK_SIZE]
+    struct.pack_into("<I", remapped, level1A, 0x40000000)
+    remapped[journalOffset:] = journal
+    half = len(remapped) // 2
+    physical = remapped[half:] + remapped[:half]
+
+    header = bytearray(0x4000)
+
+    def layout(name, value):
+        struct.pack_into("<Q", header, savefs.LAYOUT_OFFSET + savefs.LAYOUT_FIELDS[name], value)
+    header[savefs.LAYOUT_OFFSET:savefs.LAYOUT_OFFSET + 4] = b"DISF"
+    layout("file_map_entry_offset", 0x3800)
+    layout("file_map_entry_size", 2 * savefs.REMAP_ENTRY.size)
+    layout("meta_map_entry_offset", 0x3900)
+    layout("meta_map_entry_size", savefs.REMAP_ENTRY.size)
+    layout("file_map_data_offset", len(header))
+    layout("file_map_data_size", len(physical))
+    layout("duplex_l1_offset_a", level1A)
+    layout("duplex_l1_offset_b", level1B)
+    layout("duplex_l1_size", level1Size)
+    layout("duplex_data_offset_a", duplexA)
+    layout("duplex_data_offset_b", duplexB)
+    layout("duplex_data_size", META_SIZE)
+    layout("journal_data_offset", journalOffset)
+    layout("journal_data_size_b", len(journal))
+    layout("journal_size", 0)
+    layout("duplex_master_offset_a", 0x3000)
+    layout("duplex_master_offset_b", 0x3100)
+    layout("duplex_master_size", 0x10)
+    layout("journal_map_table_offset", 0)
+    layout("journal_map_table_size", len(journalMap))
+    layout("fat_offset", FAT_OFFSET)
+    layout("fat_size", len(fat))
+    header[0x3800:0x3800 + 2 * savefs.REMAP_ENTRY.size] = (
+        savefs.REMAP_ENTRY.pack(0, len(remapped) - half, half, 0, 0) +
+        savefs.REMAP_ENTRY.pack(half, 0, len(remapped) - half, 0, 0))
+    header[0x3900:0x3900 + savefs.REMAP_ENTRY.size] = savefs.REMAP_ENTRY.pack(0, 0, META_SIZE, 0, 0)
+
+    header[savefs.DUPLEX_HEADER_OFFSET:savefs.DUPLEX_HEADER_OFFSET + 4] = b"DPFS"
+    # Master bitmap, level 1 bitmap and data; only the block size powers are read
+    levels = [(0x3000, 0x10, 6), (level1A, level1Size, 8), (duplexA, META_SIZE, DUPLEX_BLOCK_SIZE.bit_length() - 1)]
+    for (level, entry) in enumerate(levels):
+        savefs.DUPLEX_LEVEL.pack_into(header, savefs.DUPLEX_HEADER_OFFSET + 0x8 + level * savefs.DUPLEX_LEVEL.size, *entry)
+    header[savefs.IVFC_HEADER_OFFSET:savefs.IVFC_HEADER_OFFSET + 4] = b"IVFC"
+    struct.pack_into("<I", header, savefs.IVFC_HEADER_OFFSET + 0xC, 5)
+    struct.pack_into("<QQ", header, savefs.IVFC_HEADER_OFFSET + 0x10 + 3 * 0x18, 0, len(data))
+    header[savefs.JOURNAL_HEADER_OFFSET:savefs.JOURNAL_HEADER_OFFSET + 4] = b"JNGL"
+    struct.pack_into("<QQQ", header, savefs.JOURNAL_HEADER_OFFSET + 0x8, len(journal), 0, BLOCK_SIZE)
+    header[savefs.SAVE_HEADER_OFFSET:savefs.SAVE_HEADER_OFFSET + 4] = b"SAVE"
+    struct.pack_into("<Q", header, savefs.SAVE_HEADER_OFFSET + 0x10, BLOCK_SIZE)
+    struct.pack_into("<II", header, savefs.SAVE_HEADER_OFFSET + 0x40, 0, 1)
+    header[savefs.MAIN_REMAP_HEADER_OFFSET:savefs.MAIN_REMAP_HEADER_OFFSET + 4] = b"RMAP"
+    struct.pack_into("<I", header, savefs.MAIN_REMAP_HEADER_OFFSET + 0x8, 2)
+    header[savefs.META_REMAP_HEADER_OFFSET:savefs.META_REMAP_HEADER_OFFSET + 4] = b"RMAP"
+    struct.pack_into("<I", header, savefs.META_REMAP_HEADER_OFFSET + 0x8, 1)
+
+    if patch is not None:
+        patch(header)
+    return bytes(header) + bytes(physical)
+
+
+def open_save(image):
+    return savefs.SaveDataFileSystem(savefs.FileStorage(io.BytesIO(image)))
+
+
+def test_files():
+    save = open_save(save_image())
+    assert save.paths() == ["/history.bin", "/sub/a.txt"]
+    assert save.read("/history.bin") == CONTENT
+    assert save.read("/sub/a.txt") == b""
+
+
+def test_read_across_blocks():
+    history = open_save(save_image()).open("/history.bin")
+    assert history.size == len(CONTENT)
+    # Blocks 4 and 6 of the chain, through the journal, duplex and remap layers
+    assert history.read(0x5F0, 0x20) == CONTENT[0x5F0:0x610]
+    assert history.read(len(CONTENT) - 4, 100) == CONTENT[-4:]
+
+
+# The DPFS header's three levels end where the IVFC header starts
+def test_header_layout():
+    assert savefs.DUPLEX_LEVEL.size == 0x14
+    assert savefs.DUPLEX_HEADER_OFFSET + 0x8 + 3 * savefs.DUPLEX_LEVEL.size == savefs.IVFC_HEADER_OFFSET
+
+
+def test_missing_file():
+    with pytest.raises(KeyError):
+        open_save(save_image()).open("/missing.bin")
+
+
+def test_bad_magic():
+    def damage(header):
+        header[savefs.JOURNAL_HEADER_OFFSET:savefs.JOURNAL_HEADER_OFFSET + 4] = b"XXXX"
+    with pytest.raises(savefs.SaveDataError):
+        open_save(save_image(damage))
+
+
+def test_cut_short():
+    with pytest.raises(savefs.SaveDataError):
+        open_save(save_image()[:0x3000])
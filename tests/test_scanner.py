@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+import re
+
+import pytest
+
+from conftest import MemorySource
+from switch_forensics.scanner import scan
+
+
+RECORD = re.compile(b"<rec(\\d{4})>")
+# Longest match RECORD can make
+OVERLAP = 10
+
+
+def found(data, bufferSize, patterns=(RECORD,), overlap=OVERLAP):
+    return [(index, bytes(match.group(0))) for (index, match) in
+            scan(MemorySource("data", data), list(patterns), overlap, bufferSize)]
+
+
+def expected(data, patterns=(RECORD,)):
+    return [(0, match.group(0)) for match in patterns[0].finditer(data)]
+
+
+# Records at every offset relative to a 64 byte read
+@pytest.mark.parametrize("shift", range(0, 64, 3))
+def test_records_split_across_reads(shift):
+    data = b"".join(b"." * (shift + index % 7) + b"<rec%04d>" % index for index in range(40))
+    assert found(data, 64) == expected(data)
+
+
+def test_match_in_the_overlap_reported_once():
+    # The record ends just before the end of the first read, inside the tail
+    # that is searched again with the next one
+    data = b"." * 56 + b"<rec0001>" + b"." * 100
+    assert found(data, 64) == [(0, b"<rec0001>")]
+
+
+def test_record_ending_the_source():
+    data = b"." * 120 + b"<rec0002>"
+    assert found(data, 64) == [(0, b"<rec0002>")]
+    # Cut short by the end of the source
+    assert found(data[:-2], 64) == []
+
+
+def test_source_smaller_than_a_read():
+    assert found(b"<rec0003><rec0004>", 64) == [(0, b"<rec0003>"), (0, b"<rec0004>")]
+    assert found(b"", 64) == []
+
+
+def test_overlapping_records_of_one_pattern():
+    # A match is taken from where the last one ended, not searched for again
+    pattern = re.compile(b"ab|ba")
+    data = (b"." * 30 + b"aba") * 10
+    assert found(data, 16, [pattern], 2) == [(0, b"ab")] * 10
+
+
+def test_match_running_into_the_overlap():
+    # "ab" starts before the tail of the first 16 byte read and ends in it. The
+    # next window starts inside it, where "ba" must not be found.
+    pattern = re.compile(b"ab|ba")
+    data = b"." * 13 + b"aba" + b"." * 20
+    assert found(data, 16, [pattern], 2) == [(0, b"ab")]
+
+
+def test_several_patterns():
+    other = re.compile(b"\\[(\\w{1,6})\\]")
+    data = b"".join(b"<rec%04d>..[w%d]...." % (index, index) for index in range(30))
+    results = found(data, 64, [RECORD, other])
+    assert len(results) == 60
+    assert [value for (index, value) in results if index == 0] == [m.group(0) for m in RECORD.finditer(data)]
+    assert [value for (index, value) in results if index == 1] == [m.group(0) for m in other.finditer(data)]
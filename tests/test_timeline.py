@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+import io
+import json
+import random
+import tempfile
+
+import pytest
+
+from switch_forensics import timeline
+
+
+def event(time, label):
+    return {"time": time, "artifact": "TSK_ART_NS_RGH", "description": label, "file": "/save/log",
+            "attributes": {"TSK_ATT_NS_RGH_GAME": u"Gäme %s" % label}}
+
+
+@pytest.fixture
+def run_files(monkeypatch):
+    files = []
+    make = tempfile.TemporaryFile
+
+    def temporary_file(*args, **kwargs):
+        runFile = make(*args, **kwargs)
+        files.append(runFile)
+        return runFile
+    monkeypatch.setattr(timeline.tempfile, "TemporaryFile", temporary_file)
+    return files
+
+
+def test_in_memory_sort(run_files):
+    events = [event(3, "c"), event(1, "a"), event(2, "b")]
+    assert [e["description"] for e in timeline.sort_events(events)] == ["a", "b", "c"]
+    assert run_files == []
+
+
+def test_spilled_runs_are_merged_in_order(run_files):
+    shuffled = random.Random(7).sample(range(1000), 1000)
+    events = [event(time, str(time)) for time in shuffled]
+    merged = list(timeline.sort_events(iter(events), runSize=64))
+    # 15 full runs spill, the last 40 events stay in memory
+    assert len(run_files) == 1000 // 64
+    assert [e["time"] for e in merged] == list(range(1000))
+    # Events come back whole, through the JSON of the run files
+    assert merged[5] == event(5, "5")
+    assert all(runFile.closed for runFile in run_files)
+
+
+def test_ties_keep_the_order_given(run_files):
+    # Every run holds events of the same few times
+    events = [event(index % 4, "%d" % index) for index in range(50)]
+    merged = list(timeline.sort_events(events, runSize=8))
+    assert len(run_files) == 6
+    assert [(e["time"], int(e["description"])) for e in merged] == sorted(
+        (index % 4, index) for index in range(50))
+
+
+def test_run_files_closed_when_stopped_early(run_files):
+    merged = timeline.sort_events([event(time, str(time)) for time in range(100, 0, -1)], runSize=10)
+    assert next(merged)["time"] == 1
+    merged.close()
+    assert len(run_files) == 10 and all(runFile.closed for runFile in run_files)
+
+
+def test_run_files_closed_when_events_fail(run_files):
+    def failing():
+        for time in range(30):
+            yield event(time, str(time))
+        raise IOError("read failed")
+
+    with pytest.raises(IOError):
+        list(timeline.sort_events(failing(), runSize=10))
+    assert len(run_files) == 3 and all(runFile.closed for runFile in run_files)
+
+
+def test_write_ndjson():
+    out = io.StringIO()
+    timeline.write_ndjson(timeline.sort_events([event(86400, "b"), event(0, "a")]), out)
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [(line["utc"], line["description"]) for line in lines] == [
+        ("1970-01-01 00:00:00", "a"), ("1970-01-02 00:00:00", "b")]